@@ -3,11 +3,16 @@ E-commerce Web Application using Streamlit
 """
 import streamlit as st
 import pandas as pd
-from product_manager import ProductManager
+from product_manager import ProductManager, PAGE_SIZE, COUNT_LIMIT
+
+@st.cache_resource
+def get_product_manager():
+    """One ProductManager (and its database connections) per server process, reused across reruns"""
+    return ProductManager()
 
 class EcommerceApp:
     def __init__(self):
-        self.product_manager = ProductManager()
+        self.product_manager = get_product_manager()
         
     def run(self):
         """Main application runner"""
@@ -70,16 +75,17 @@ class EcommerceApp:
             # BUG 15: Search button doesn't actually trigger search
             search_button = st.button("Search")
         
-        # Get products
-        if search_term:
-            products = self.product_manager.search_products(search_term)
-        else:
-            products = self.product_manager.get_all_products()
-        
-        if not products:
+        # Get one page of products (search runs in the database)
+        total = self.product_manager.count_products(search_term)
+        if not total:
             st.warning("No products found!")
             return
         
+        products = self.show_page_controls(
+            "products_pages", search_term, total,
+            lambda after: self.product_manager.search_products(search_term, after=after)
+        )
+        
         # Display products
         for i in range(0, len(products), 2):
             cols = st.columns(2)
@@ -119,6 +125,33 @@ class EcommerceApp:
                             else:
                                 st.error(message)
         
+    @staticmethod
+    def format_count(count):
+        return f"{COUNT_LIMIT}+" if count > COUNT_LIMIT else str(count)
+    
+    def show_page_controls(self, key, reset_on, total, fetch_page):
+        """Previous/Next paging; fetch_page(cursor) returns (items, cursor of the next page or None).
+        
+        The cursors of the pages visited so far are kept in session state (for Previous) and
+        reset when `reset_on` (e.g. the search term) changes.
+        """
+        state = st.session_state.get(key)
+        if state is None or state["reset_on"] != reset_on:
+            state = st.session_state[key] = {"reset_on": reset_on, "cursors": [None]}
+        cursors = state["cursors"]
+        items, next_cursor = fetch_page(cursors[-1])
+        
+        first = (len(cursors) - 1) * PAGE_SIZE + 1
+        st.caption(f"Showing {first}–{first + len(items) - 1} of {self.format_count(total)}")
+        col1, col2, _ = st.columns([1, 1, 4])
+        if len(cursors) > 1 and col1.button("← Previous", key=f"{key}_previous"):
+            cursors.pop()
+            st.rerun()
+        if next_cursor is not None and col2.button("Next →", key=f"{key}_next"):
+            cursors.append(next_cursor)
+            st.rerun()
+        return items
+    
     def show_cart_page(self):
         """Display cart page"""
         st.header("Shopping Cart")
@@ -165,7 +198,7 @@ class EcommerceApp:
         success, result = self.product_manager.process_checkout()
         
         if success:
-            st.success("Order processed successfully!")
+            st.success(f"Order #{result['order_id']} processed successfully!")
             
             # Display order summary
             st.subheader("Order Summary")
@@ -244,11 +277,15 @@ class EcommerceApp:
             
             threshold = st.number_input("Stock Threshold", min_value=1, value=5)
             
-            # BUG 22: Low stock function has logic error (from ProductManager)
-            low_stock_products = self.product_manager.get_low_stock_products(threshold)
+            low_stock_count = self.product_manager.count_low_stock_products(threshold)
             
-            if low_stock_products:
-                st.warning(f"Found {len(low_stock_products)} products with low stock!")
+            if low_stock_count:
+                st.warning(f"Found {self.format_count(low_stock_count)} products with low stock!")
+                
+                low_stock_products = self.show_page_controls(
+                    "low_stock_pages", threshold, low_stock_count,
+                    lambda after: self.product_manager.get_low_stock_products(threshold, after=after)
+                )
                 
                 low_stock_data = []
                 for product in low_stock_products:
@@ -0,0 +1,297 @@
+"""
+Performance benchmarks for the database layer
+
+    python benchmark.py cart [--ops 5000] [--threads 4]
+    python benchmark.py search [--sizes 1000 10000 100000] [--queries 200]
+    python benchmark.py checkout [--checkouts 2000] [--threads 8] [--stock 500]
+
+cart: cart operations per second (add to cart, read the cart, clear it), with the
+previous connection-per-call layer ("before") and the current DatabaseManager
+("after"). Each run uses a fresh database in a temporary directory.
+
+search: latency of the search and low-stock listings as the catalog grows, with
+the previous full-table Python scan ("before", the same cost for any page or
+count) and the FTS5/indexed queries ("after": first page, a page half-way
+through the catalog, and the capped result count the app shows with each page).
+Times are the median and the slowest search term.
+
+checkout: threads that each add to the cart and check out, against a limited
+stock, with a step-by-step check-then-update checkout ("before") and the
+transactional DatabaseManager.checkout ("after"). Reports checkouts per second
+and how many items were sold beyond the available stock (must be 0 after).
+"""
+import argparse
+import os
+import random
+import re
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from database import DatabaseManager
+from product_manager import ProductManager
+
+
+class ConnectionPerCallCart:
+    """The cart operations as they were before connection reuse: a new connection per call"""
+
+    def __init__(self, db_name):
+        self.db_name = db_name
+
+    def get_product_by_id(self, product_id):
+        conn = sqlite3.connect(self.db_name)
+        product = conn.execute(f"SELECT * FROM products WHERE id = {product_id}").fetchone()
+        conn.close()
+        return product
+
+    def add_to_cart(self, product_id, quantity):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        product = self.get_product_by_id(product_id)
+        if not product or product[4] < quantity:
+            return False
+        cursor.execute("SELECT * FROM cart WHERE product_id = ?", (product_id,))
+        existing_item = cursor.fetchone()
+        if existing_item:
+            cursor.execute("UPDATE cart SET quantity = ? WHERE product_id = ?",
+                           (existing_item[2] + quantity, product_id))
+        else:
+            cursor.execute("INSERT INTO cart (product_id, quantity) VALUES (?, ?)", (product_id, quantity))
+        conn.commit()
+        conn.close()
+        return True
+
+    def get_cart_items(self):
+        conn = sqlite3.connect(self.db_name)
+        items = conn.execute(
+            "SELECT c.id, p.name, p.price, c.quantity, p.description"
+            " FROM cart c JOIN products p ON c.product_id = p.id"
+        ).fetchall()
+        conn.close()
+        return items
+
+    def clear_cart(self):
+        conn = sqlite3.connect(self.db_name)
+        conn.execute("DELETE FROM cart")
+        conn.commit()
+        conn.close()
+
+
+def cart_workload(db, ops):
+    """`ops` cart operations: mostly adds and reads, clearing the cart every 50 operations"""
+    for i in range(ops):
+        if i % 50 == 49:
+            db.clear_cart()
+        elif i % 2:
+            db.get_cart_items()
+        else:
+            db.add_to_cart(1 + i % 4, 1)
+
+
+def run_threads(db, ops, threads):
+    workers = [threading.Thread(target=cart_workload, args=(db, ops // threads)) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (ops // threads) * threads / (time.perf_counter() - start)
+
+
+def bench_cart(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        for threads in sorted({1, args.threads}):
+            # Same schema and sample data for both, created by DatabaseManager
+            before_path = os.path.join(tmp, f"before_{threads}.db")
+            DatabaseManager(before_path).close()
+            with sqlite3.connect(before_path) as conn:
+                conn.execute("PRAGMA journal_mode=DELETE")  # the old default
+            before = run_threads(ConnectionPerCallCart(before_path), args.ops, threads)
+
+            after = run_threads(DatabaseManager(os.path.join(tmp, f"after_{threads}.db")), args.ops, threads)
+            print(f"{threads} thread(s): before {before:8.0f} ops/s | after {after:8.0f} ops/s | {after / before:4.1f}x")
+
+
+WORDS = ["wireless", "mouse", "keyboard", "monitor", "laptop", "stand", "usb", "cable",
+         "headphones", "speaker", "webcam", "charger", "desk", "lamp", "ergonomic", "gaming",
+         "portable", "bluetooth", "mechanical", "adjustable", "premium", "compact", "smart", "hub"]
+SEARCH_TERMS = ["wire", "Gaming mouse", "usb cable", "ERGONOMIC", "desk lamp", "sma"]
+
+
+def fill_catalog(db, size, seed=0):
+    """Add synthetic products until the catalog has `size` rows"""
+    rng = random.Random(seed)
+    missing = size - db.count_products()
+    rows = [(" ".join(rng.sample(WORDS, 3)).title(), round(rng.uniform(5, 500), 2),
+             " ".join(rng.sample(WORDS, 8)), rng.randint(0, 200)) for _ in range(missing)]
+    with db.get_connection() as conn:
+        conn.executemany("INSERT INTO products (name, price, description, stock) VALUES (?, ?, ?, ?)", rows)
+
+
+def scan_search(db, term, per_page):
+    """The search as it was before (every product into a dict, then a Python substring scan),
+    matching what the new search matches: every word, ignoring case, in name or description"""
+    words = re.findall(r"\w+", term.lower())
+    products = [{"id": p[0], "name": p[1], "price": p[2], "description": p[3], "stock": p[4]}
+                for p in db.get_all_products()]
+    matches = [p for p in products
+               if all(word in f"{p['name']} {p['description']}".lower() for word in words)]
+    return matches[:per_page]
+
+
+def scan_low_stock(db, threshold, per_page):
+    products = [{"id": p[0], "name": p[1], "price": p[2], "description": p[3], "stock": p[4]}
+                for p in db.get_all_products()]
+    return [p for p in products if p["stock"] <= threshold][:per_page]
+
+
+def timed_ms(func, terms, repeat):
+    """(median, slowest) over the terms of each term's median time in ms"""
+    per_term = []
+    for term in terms:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(term)
+            times.append(time.perf_counter() - start)
+        per_term.append(statistics.median(times) * 1000)
+    return statistics.median(per_term), max(per_term)
+
+
+def bench_search(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = ProductManager(os.path.join(tmp, "search.db"))
+        if not manager.db.fts_enabled:
+            print("note: this SQLite build has no FTS5, 'after' uses the LIKE fallback")
+        thresholds = [5, 50]
+        repeat = max(1, args.queries // len(SEARCH_TERMS))
+        for size in sorted(args.sizes):
+            fill_catalog(manager.db, size)
+            middle = size // 2
+            # The full scans are slow on big catalogs, so they get fewer repetitions
+            rows = {
+                "search": (
+                    timed_ms(lambda term: scan_search(manager.db, term, 20), SEARCH_TERMS, max(1, repeat // 20)),
+                    timed_ms(lambda term: manager.search_products(term), SEARCH_TERMS, repeat),
+                    timed_ms(lambda term: manager.search_products(term, after=middle), SEARCH_TERMS, repeat),
+                    timed_ms(lambda term: manager.count_products(term), SEARCH_TERMS, repeat),
+                ),
+                "low stock": (
+                    timed_ms(lambda t: scan_low_stock(manager.db, t, 20), thresholds, max(1, repeat // 20)),
+                    timed_ms(lambda t: manager.get_low_stock_products(t), thresholds, repeat),
+                    timed_ms(lambda t: manager.get_low_stock_products(t, after=(t // 2, middle)), thresholds, repeat),
+                    timed_ms(lambda t: manager.count_low_stock_products(t), thresholds, repeat),
+                ),
+            }
+            for name, (before, first, deep, count) in rows.items():
+                print(f"{size:>7} products, {name:<9}: before {before[0]:7.2f} ms (max {before[1]:7.2f})"
+                      f" | after: page 1 {first[0]:5.2f} (max {first[1]:5.2f})"
+                      f", deep page {deep[0]:5.2f} (max {deep[1]:5.2f})"
+                      f", count {count[0]:5.2f} (max {count[1]:5.2f}) ms")
+        manager.db.close()
+
+
+class StepwiseCheckout:
+    """Checkout done as separate steps (read cart, check stock, update each product, clear cart),
+    each committed on its own; stands in for a checkout without one enclosing transaction"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def checkout(self, tax_rate):
+        conn = self.db.get_connection()
+        items = conn.execute(
+            "SELECT c.product_id, SUM(c.quantity), p.stock FROM cart c"
+            " JOIN products p ON c.product_id = p.id GROUP BY c.product_id"
+        ).fetchall()
+        if not items:
+            raise ValueError("Cart is empty")
+        if any(quantity > stock for _, quantity, stock in items):
+            raise ValueError("Not enough stock")
+        for product_id, quantity, _ in items:
+            with conn:
+                conn.execute("UPDATE products SET stock = stock - ? WHERE id = ?", (quantity, product_id))
+        with conn:
+            conn.execute("INSERT INTO orders (item_count) VALUES (?)", (len(items),))
+            conn.executemany(
+                "INSERT INTO order_items (order_id, product_id, quantity) VALUES (last_insert_rowid(), ?, ?)",
+                [(product_id, quantity) for product_id, quantity, _ in items])
+        self.db.clear_cart()
+
+
+def checkout_workload(db, checkout, count, seed, outcome):
+    rng = random.Random(seed)
+    for _ in range(count):
+        db.add_to_cart(rng.randint(1, 4), rng.randint(1, 3))
+        try:
+            checkout(0.08)
+            outcome["orders"] += 1
+        except ValueError:
+            outcome["rejected"] += 1  # out of stock, or another thread checked the cart out first
+
+
+def run_checkouts(db_path, make_checkout, args):
+    db = DatabaseManager(db_path)
+    with db.get_connection() as conn:
+        conn.execute("UPDATE products SET stock = ?", (args.stock,))
+    checkout = make_checkout(db).checkout
+    per_thread = args.checkouts // args.threads
+    outcomes = [{"orders": 0, "rejected": 0} for _ in range(args.threads)]
+    workers = [threading.Thread(target=checkout_workload, args=(db, checkout, per_thread, seed, outcomes[seed]))
+               for seed in range(args.threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    seconds = time.perf_counter() - start
+
+    conn = db.get_connection()
+    sold = dict(conn.execute("SELECT product_id, SUM(quantity) FROM order_items GROUP BY product_id").fetchall())
+    oversold = sum(max(0, quantity - args.stock) for quantity in sold.values())
+    negative = conn.execute("SELECT COUNT(*) FROM products WHERE stock < 0").fetchone()[0]
+    db.close()
+    return {
+        "attempts_per_s": per_thread * args.threads / seconds,
+        "orders": sum(o["orders"] for o in outcomes),
+        "oversold": oversold,
+        "negative": negative,
+    }
+
+
+def bench_checkout(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, make_checkout in (("before", StepwiseCheckout), ("after", lambda db: db)):
+            r = run_checkouts(os.path.join(tmp, f"{label}.db"), make_checkout, args)
+            print(f"{label:>6}: {r['attempts_per_s']:7.0f} attempts/s | {r['orders']:5} orders"
+                  f" | {r['oversold']:4} items oversold | {r['negative']} products below zero stock")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database layer benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cart = commands.add_parser("cart", help="cart operations per second, before/after connection reuse")
+    cart.add_argument("--ops", type=int, default=5000)
+    cart.add_argument("--threads", type=int, default=4)
+    cart.set_defaults(run=bench_cart)
+
+    search = commands.add_parser("search", help="search/low-stock page latency as the catalog grows")
+    search.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    search.add_argument("--queries", type=int, default=200)
+    search.set_defaults(run=bench_search)
+
+    checkout = commands.add_parser("checkout", help="concurrent checkout stress test (throughput, overselling)")
+    checkout.add_argument("--checkouts", type=int, default=2000)
+    checkout.add_argument("--threads", type=int, default=8)
+    checkout.add_argument("--stock", type=int, default=500, help="starting stock of every product")
+    checkout.set_defaults(run=bench_checkout)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,71 @@
 """
 Database handler for E-commerce application
+
+Each thread reuses one connection (created on first use) instead of opening a
+new one per call. When a thread ends, its connection goes back to an idle
+pool for the next thread (Streamlit runs every rerun in a new thread), so one
+long-lived DatabaseManager keeps its connections for the life of the process.
+Connections run in WAL mode, so readers do not block the writer, and keep a
+prepared-statement cache, so the constant, parameterized queries below are
+compiled once per connection.
+
+Search and low-stock queries run in SQLite: products_fts is an FTS5 index over
+name/description (kept in sync by triggers) and idx_products_stock indexes
+stock, so both stay fast and paginated as the catalog grows.
+
+Checkout is a single BEGIN IMMEDIATE transaction (see checkout()), so
+concurrent checkouts are serialized and stock can never be oversold.
 """
 import sqlite3
 import os
+import queue
+import re
+import threading
+import weakref
+
+# Per-connection settings
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",      # concurrent readers alongside one writer
+    "PRAGMA synchronous=NORMAL",    # safe with WAL, far fewer fsyncs than FULL
+    "PRAGMA cache_size=-16000",     # 16 MB page cache
+    "PRAGMA temp_store=MEMORY",
+)
+STATEMENT_CACHE_SIZE = 256  # prepared statements kept per connection
+BUSY_TIMEOUT = 10.0  # seconds to wait for a lock held by another connection
+# Prefix lengths indexed by products_fts. A search word of one of these lengths is
+# read straight from the index; longer words must merge every matching term, which
+# is slow for common words in a large catalog.
+FTS_PREFIXES = "2 3 4 5 6 7 8 9 10"
+
+# Checkout's stock decrement: UPDATE ... FROM needs SQLite 3.33+; older versions
+# use the equivalent correlated UPDATE
+if sqlite3.sqlite_version_info >= (3, 33, 0):
+    DECREMENT_STOCK = '''
+        UPDATE products SET stock = stock - c.quantity
+        FROM (SELECT product_id, SUM(quantity) AS quantity FROM cart GROUP BY product_id) AS c
+        WHERE products.id = c.product_id AND products.stock >= c.quantity
+    '''
+else:
+    DECREMENT_STOCK = '''
+        UPDATE products SET stock = stock - (SELECT SUM(quantity) FROM cart WHERE product_id = products.id)
+        WHERE id IN (SELECT product_id FROM cart)
+          AND stock >= (SELECT SUM(quantity) FROM cart WHERE product_id = products.id)
+    '''
+
+class _ThreadToken:
+    """Held in a thread's local storage; collected when the thread ends"""
+
 
 class DatabaseManager:
     def __init__(self, db_name="ecommerce.db"):
         self.db_name = db_name
+        self._local = threading.local()
+        self._idle = queue.SimpleQueue()  # connections of threads that have ended
         self.init_database()
     
     def init_database(self):
         """Initialize database with required tables"""
-        conn = sqlite3.connect(self.db_name)
+        conn = self.get_connection()
         cursor = conn.cursor()
         
         # Products table
@@ -25,6 +79,12 @@ class DatabaseManager:
             )
         ''')
         
+        # Index for low-stock queries
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_stock ON products (stock)")
+        
+        # Full-text index over name/description
+        self.fts_enabled = self._init_search_index(cursor)
+        
         # Cart table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS cart (
@@ -35,6 +95,28 @@ class DatabaseManager:
             )
         ''')
         
+        # Orders written by checkout
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS orders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                item_count INTEGER,
+                subtotal REAL,
+                tax REAL,
+                total REAL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS order_items (
+                order_id INTEGER,
+                product_id INTEGER,
+                quantity INTEGER,
+                price REAL,
+                FOREIGN KEY (order_id) REFERENCES orders (id),
+                FOREIGN KEY (product_id) REFERENCES products (id)
+            )
+        ''')
+        
         # Insert sample data if products table is empty
         cursor.execute("SELECT COUNT(*) FROM products")
         if cursor.fetchone()[0] == 0:
@@ -50,11 +132,87 @@ class DatabaseManager:
             )
         
         conn.commit()
-        conn.close()
+    
+    def _init_search_index(self, cursor):
+        """Create the FTS5 index and its sync triggers; False if this SQLite has no FTS5"""
+        cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'products_fts'")
+        row = cursor.fetchone()
+        existed = row is not None
+        try:
+            if existed and f"prefix='{FTS_PREFIXES}'" not in row[0]:
+                # Built with other prefix lengths: recreate it (the triggers stay)
+                cursor.execute("DROP TABLE products_fts")
+                existed = False
+            cursor.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+                    name, description,
+                    content='products', content_rowid='id',
+                    tokenize='unicode61', prefix='{FTS_PREFIXES}'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            return False
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+                INSERT INTO products_fts (rowid, name, description) VALUES (new.id, new.name, new.description);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+                INSERT INTO products_fts (products_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+            END
+        ''')
+        # Only name/description changes touch the index (stock updates do not)
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS products_fts_update AFTER UPDATE OF name, description ON products BEGIN
+                INSERT INTO products_fts (products_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+                INSERT INTO products_fts (rowid, name, description) VALUES (new.id, new.name, new.description);
+            END
+        ''')
+        
+        if not existed:
+            # Index products added before the index existed
+            cursor.execute("INSERT INTO products_fts (products_fts) VALUES ('rebuild')")
+        return True
+    
+    def _connect(self):
+        # Used by one thread at a time, but possibly a different one after recycling
+        conn = sqlite3.connect(
+            self.db_name,
+            timeout=BUSY_TIMEOUT,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            check_same_thread=False,
+        )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
     
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_name)
+        """Get this thread's database connection (an idle one, or opened on first use)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            try:
+                conn = self._idle.get_nowait()
+                if conn.in_transaction:
+                    conn.rollback()  # left open by the thread that ended
+            except queue.Empty:
+                conn = self._connect()
+            self._local.conn = conn
+            # Hand the connection back when this thread ends
+            self._local.token = _ThreadToken()
+            self._local.release = weakref.finalize(self._local.token, self._idle.put, conn)
+        return conn
+    
+    def close(self):
+        """Close this thread's connection (a new one is opened on next use)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.release.detach()
+            conn.close()
+            self._local.conn = None
     
     def get_all_products(self):
         """Get all products from database"""
@@ -64,19 +222,83 @@ class DatabaseManager:
         # BUG 1: SQL injection vulnerability - using string formatting instead of parameterized queries
         cursor.execute("SELECT * FROM products")
         products = cursor.fetchall()
-        conn.close()
         return products
     
+    def count_products(self, limit=-1):
+        """Number of products in the catalog, counting no further than limit (-1: no limit)"""
+        return self.get_connection().execute(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM products LIMIT ?)", (limit,)
+        ).fetchone()[0]
+    
+    def get_products_page(self, limit, after_id=0):
+        """One page of products in catalog order, starting after product after_id"""
+        return self.get_connection().execute(
+            "SELECT * FROM products WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+        ).fetchall()
+    
+    @staticmethod
+    def _fts_query(search_term):
+        """'Wire head' -> '"wire"* "head"*': every word must match the start of a word"""
+        words = re.findall(r"\w+", search_term.lower())
+        return " ".join(f'"{word}"*' for word in words)
+    
+    def _search_where(self, search_term):
+        """(join + WHERE clause, key column, parameters) selecting the products matching search_term.
+        
+        With FTS5 the key is the index's rowid, so id ranges and ordering are resolved inside the index.
+        """
+        if self.fts_enabled:
+            return ("products_fts f JOIN products p ON p.id = f.rowid WHERE products_fts MATCH ?",
+                    "f.rowid", [self._fts_query(search_term)])
+        pattern = f"%{search_term}%"
+        return "products p WHERE (p.name LIKE ? OR p.description LIKE ?)", "p.id", [pattern, pattern]
+    
+    def search_products(self, search_term, limit, after_id=0):
+        """Products whose name or description contains words starting with each search word
+        (case-insensitive), in catalog order, starting after product after_id.
+        
+        Pages are found by id (keyset), not OFFSET, so a deep page costs the same as the first.
+        """
+        if not self._fts_query(search_term):
+            return []
+        where, key, params = self._search_where(search_term)
+        return self.get_connection().execute(
+            f"SELECT p.* FROM {where} AND {key} > ? ORDER BY {key} LIMIT ?", params + [after_id, limit]
+        ).fetchall()
+    
+    def count_search_results(self, search_term, limit):
+        """Number of products search_products pages through, counting no further than limit"""
+        if not self._fts_query(search_term):
+            return 0
+        where, _, params = self._search_where(search_term)
+        return self.get_connection().execute(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM {where} LIMIT ?)", params + [limit]
+        ).fetchone()[0]
+    
+    def get_low_stock_products(self, threshold, limit, after=None):
+        """Products with stock at or below threshold, lowest stock first (uses idx_products_stock).
+        
+        after is the (stock, id) of the last product of the previous page.
+        """
+        after_stock, after_id = after or (-1, 0)
+        return self.get_connection().execute(
+            "SELECT * FROM products WHERE stock <= ? AND (stock, id) > (?, ?) ORDER BY stock, id LIMIT ?",
+            (threshold, after_stock, after_id, limit)
+        ).fetchall()
+    
+    def count_low_stock_products(self, threshold, limit):
+        return self.get_connection().execute(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM products WHERE stock <= ? LIMIT ?)", (threshold, limit)
+        ).fetchone()[0]
+    
     def get_product_by_id(self, product_id):
         """Get product by ID"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        # BUG 2: Not using parameterized query properly
-        query = f"SELECT * FROM products WHERE id = {product_id}"
-        cursor.execute(query)
+        # Parameterized, so the statement is prepared once and reused
+        cursor.execute("SELECT * FROM products WHERE id = ?", (product_id,))
         product = cursor.fetchone()
-        conn.close()
         return product
     
     def add_to_cart(self, product_id, quantity):
@@ -97,18 +319,18 @@ class DatabaseManager:
         cursor.execute("SELECT * FROM cart WHERE product_id = ?", (product_id,))
         existing_item = cursor.fetchone()
         
-        if existing_item:
-            # Update quantity
-            new_quantity = existing_item[2] + quantity
-            cursor.execute("UPDATE cart SET quantity = ? WHERE product_id = ?", 
-                         (new_quantity, product_id))
-        else:
-            # Add new item
-            cursor.execute("INSERT INTO cart (product_id, quantity) VALUES (?, ?)", 
-                         (product_id, quantity))
+        # The connection outlives this call, so commit on success / roll back on error
+        with conn:
+            if existing_item:
+                # Update quantity
+                new_quantity = existing_item[2] + quantity
+                cursor.execute("UPDATE cart SET quantity = ? WHERE product_id = ?", 
+                             (new_quantity, product_id))
+            else:
+                # Add new item
+                cursor.execute("INSERT INTO cart (product_id, quantity) VALUES (?, ?)", 
+                             (product_id, quantity))
         
-        conn.commit()
-        conn.close()
         return True
     
     def get_cart_items(self):
@@ -123,16 +345,81 @@ class DatabaseManager:
         ''')
         
         cart_items = cursor.fetchall()
-        conn.close()
         return cart_items
     
     def clear_cart(self):
         """Clear all items from cart"""
         conn = self.get_connection()
+        with conn:
+            conn.execute("DELETE FROM cart")
+    
+    def checkout(self, tax_rate):
+        """Turn the cart into an order in one transaction.
+        
+        BEGIN IMMEDIATE takes the write lock before stock is read, so no other
+        checkout can change stock between the check and the decrement. Stock is
+        decremented with one UPDATE ... FROM over the cart, then the order is
+        recorded and the cart cleared; any failure rolls all of it back.
+        
+        Returns the order as a dict; raises ValueError if the cart is empty or
+        a product does not have enough stock (nothing is changed then), and
+        sqlite3.OperationalError if the database stays locked past BUSY_TIMEOUT.
+        """
+        conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM cart")
-        conn.commit()
-        conn.close()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            cursor.execute('''
+                SELECT p.id, p.name, p.price, SUM(c.quantity), p.description, p.stock
+                FROM cart c
+                JOIN products p ON c.product_id = p.id
+                GROUP BY p.id
+                ORDER BY MIN(c.id)
+            ''')
+            items = cursor.fetchall()
+            if not items:
+                raise ValueError("Cart is empty")
+            
+            short = [f"only {stock} {name} available" for _, name, _, quantity, _, stock in items if quantity > stock]
+            if short:
+                raise ValueError("Not enough stock: " + ", ".join(short))
+            
+            cursor.execute(DECREMENT_STOCK)
+            if cursor.rowcount != len(items):
+                raise ValueError("Not enough stock")
+            
+            subtotal = sum(price * quantity for _, _, price, quantity, _, _ in items)
+            tax = subtotal * tax_rate
+            cursor.execute(
+                "INSERT INTO orders (item_count, subtotal, tax, total) VALUES (?, ?, ?, ?)",
+                (len(items), subtotal, tax, subtotal + tax)
+            )
+            order_id = cursor.lastrowid
+            cursor.execute('''
+                INSERT INTO order_items (order_id, product_id, quantity, price)
+                SELECT ?, c.product_id, SUM(c.quantity), p.price
+                FROM cart c
+                JOIN products p ON c.product_id = p.id
+                GROUP BY c.product_id
+            ''', (order_id,))
+            cursor.execute("DELETE FROM cart")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        
+        return {
+            'order_id': order_id,
+            'items': [
+                {'id': product_id, 'name': name, 'price': price, 'quantity': quantity,
+                 'description': description, 'subtotal': price * quantity}
+                for product_id, name, price, quantity, description, _ in items
+            ],
+            'subtotal': subtotal,
+            'tax': tax,
+            'total': subtotal + tax,
+            'item_count': len(items)
+        }
     
     def add_product(self, name, price, description, stock):
         """Add new product to database"""
@@ -140,11 +427,10 @@ class DatabaseManager:
         cursor = conn.cursor()
         
         # BUG 4: Missing input validation
-        cursor.execute(
-            "INSERT INTO products (name, price, description, stock) VALUES (?, ?, ?, ?)",
-            (name, price, description, stock)
-        )
+        with conn:
+            cursor.execute(
+                "INSERT INTO products (name, price, description, stock) VALUES (?, ?, ?, ?)",
+                (name, price, description, stock)
+            )
         
-        conn.commit()
-        conn.close()
         return True
@@ -2,28 +2,34 @@
 Product Manager for E-commerce application
 Handles business logic for products and cart operations
 """
+import sqlite3
+
 from database import DatabaseManager
 
+# Products per page for search results and low-stock listings
+PAGE_SIZE = 20
+# Result counts stop here and are shown as "1000+"
+COUNT_LIMIT = 1000
+
+TAX_RATE = 0.08  # 8% tax
+
 class ProductManager:
-    def __init__(self):
-        self.db = DatabaseManager()
+    def __init__(self, db_name="ecommerce.db"):
+        self.db = DatabaseManager(db_name)
+    
+    @staticmethod
+    def _to_dict(product):
+        return {
+            'id': product[0],
+            'name': product[1],
+            'price': product[2],
+            'description': product[3],
+            'stock': product[4]
+        }
     
     def get_all_products(self):
         """Get all products with formatted data"""
-        products = self.db.get_all_products()
-        formatted_products = []
-        
-        for product in products:
-            formatted_product = {
-                'id': product[0],
-                'name': product[1],
-                'price': product[2],
-                'description': product[3],
-                'stock': product[4]
-            }
-            formatted_products.append(formatted_product)
-        
-        return formatted_products
+        return [self._to_dict(product) for product in self.db.get_all_products()]
     
     def get_product_details(self, product_id):
         """Get detailed product information"""
@@ -94,34 +100,22 @@ class ProductManager:
     
     def calculate_total_with_tax(self, subtotal):
         """Calculate total amount including tax"""
-        # BUG 9: Hard-coded tax rate without configuration
-        tax_rate = 0.08  # 8% tax
-        tax_amount = subtotal * tax_rate
+        tax_amount = subtotal * TAX_RATE
         return subtotal + tax_amount
     
     def process_checkout(self):
-        """Process checkout and return order summary"""
-        cart_summary = self.get_cart_summary()
-        
-        if not cart_summary['items']:
-            return False, "Cart is empty"
+        """Process checkout and return order summary.
         
-        # BUG 10: Not updating stock after checkout
-        subtotal = cart_summary['total']
-        total_with_tax = self.calculate_total_with_tax(subtotal)
-        
-        # Clear cart after checkout
-        self.db.clear_cart()
-        
-        order_summary = {
-            'items': cart_summary['items'],
-            'subtotal': subtotal,
-            'tax': total_with_tax - subtotal,
-            'total': total_with_tax,
-            'item_count': cart_summary['item_count']
-        }
-        
-        return True, order_summary
+        Stock check, stock update, order record and clearing the cart happen in
+        one database transaction, so concurrent checkouts cannot oversell.
+        """
+        try:
+            return True, self.db.checkout(TAX_RATE)
+        except ValueError as e:
+            return False, str(e)
+        except sqlite3.OperationalError:
+            # e.g. "database is locked": other checkouts held the lock past BUSY_TIMEOUT
+            return False, "The store is busy right now, please try again"
     
     def add_new_product(self, name, price, description, stock):
         """Add new product with validation"""
@@ -145,29 +139,35 @@ class ProductManager:
         except Exception as e:
             return False, f"Error: {str(e)}"
     
-    def search_products(self, search_term):
-        """Search products by name"""
-        all_products = self.get_all_products()
+    def search_products(self, search_term, after=None, per_page=PAGE_SIZE):
+        """One page of products matching every word of search_term (case-insensitive prefix
+        match on name or description); all products when search_term is empty.
         
-        if not search_term:
-            return all_products
-        
-        # BUG 13: Case-sensitive search
-        filtered_products = []
-        for product in all_products:
-            if search_term in product['name']:
-                filtered_products.append(product)
-        
-        return filtered_products
+        Returns (products, cursor of the next page or None); pass the cursor as `after`.
+        """
+        if not search_term or not search_term.strip():
+            rows = self.db.get_products_page(per_page + 1, after or 0)
+        else:
+            rows = self.db.search_products(search_term, per_page + 1, after or 0)
+        products = [self._to_dict(row) for row in rows[:per_page]]
+        return products, products[-1]['id'] if len(rows) > per_page else None
     
-    def get_low_stock_products(self, threshold=5):
-        """Get products with low stock"""
-        all_products = self.get_all_products()
-        low_stock_products = []
-        
-        for product in all_products:
-            # BUG 14: Using >= instead of <=
-            if product['stock'] >= threshold:
-                low_stock_products.append(product)
+    def count_products(self, search_term=""):
+        """Number of products search_products pages through, up to COUNT_LIMIT + 1
+        (more than COUNT_LIMIT is shown as "1000+", so a common word costs no more to count)"""
+        if not search_term or not search_term.strip():
+            return self.db.count_products(COUNT_LIMIT + 1)
+        return self.db.count_search_results(search_term, COUNT_LIMIT + 1)
+    
+    def get_low_stock_products(self, threshold=5, after=None, per_page=PAGE_SIZE):
+        """One page of products with stock at or below threshold, lowest stock first.
         
-        return low_stock_products
+        Returns (products, cursor of the next page or None) like search_products.
+        """
+        rows = self.db.get_low_stock_products(threshold, per_page + 1, after)
+        products = [self._to_dict(row) for row in rows[:per_page]]
+        last = products[-1] if products else None
+        return products, (last['stock'], last['id']) if len(rows) > per_page else None
+    
+    def count_low_stock_products(self, threshold=5):
+        return self.db.count_low_stock_products(threshold, COUNT_LIMIT + 1)
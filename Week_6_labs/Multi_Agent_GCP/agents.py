@@ -1,98 +1,333 @@
-from crewai import Agent, Task, Crew, Process, LLM
 from dotenv import load_dotenv
-import os 
+from functools import lru_cache
+import os
+import asyncio
+import queue
+import threading
+import time
 
-# Load environment variables
-load_dotenv()  
+from monitoring import CrewMonitor
 
-# Get API key with validation
-api_key = os.getenv("GOOGLE_API_KEY")
-if not api_key:
-    raise ValueError("GOOGLE_API_KEY not found in environment variables. Please set it in your environment or .env file.")
+# Importing this module is cheap: crewai (and litellm behind it) is only
+# imported, and the LLM only created, when the first crew is built.
 
-os.environ["GOOGLE_API_KEY"] = api_key
 
-llm = LLM(
-    model="gemini/gemini-1.5-flash",
-    api_key=api_key  # Explicitly pass the API key
-)
+def api_key_configured():
+    """True if GOOGLE_API_KEY is set (in the environment or .env)"""
+    load_dotenv()
+    return bool(os.getenv("GOOGLE_API_KEY"))
+
+
+@lru_cache(maxsize=None)
+def get_llm():
+    """Create the shared Gemini LLM on first use"""
+    from crewai import LLM
+
+    # Load environment variables
+    load_dotenv()
+
+    # Get API key with validation
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise ValueError("GOOGLE_API_KEY not found in environment variables. Please set it in your environment or .env file.")
+
+    os.environ["GOOGLE_API_KEY"] = api_key
+
+    return LLM(
+        model="gemini/gemini-1.5-flash",
+        api_key=api_key  # Explicitly pass the API key
+    )
+
+# How long (seconds) a finished result is reused for the same topic
+CACHE_TTL = float(os.getenv("CREW_CACHE_TTL", "3600"))
+
+# Max tokens one run of each crew may use before it is stopped (0 = no limit)
+TOKEN_BUDGETS = {
+    "research": int(os.getenv("RESEARCH_MAX_TOKENS", "20000")),
+    "blog": int(os.getenv("BLOG_MAX_TOKENS", "60000")),
+}
+
+# Parallel blog mode: independent aspects of the topic, researched concurrently
+FACETS = [
+    "background and key facts",
+    "current trends and real-world examples",
+    "challenges, risks and future outlook",
+]
+
+
+def build_research_crew():
+    """Research crew template; {topic} is filled in at kickoff"""
+    from crewai import Agent, Task, Crew
 
-def research_agent(topic):
-    """Simple research function"""
-    
     # Create the research agent
     researcher = Agent(
         role='Researcher',
         goal='Research topics and provide useful information',
         backstory='You are a helpful researcher who finds good information about topics.',
-        llm=llm
+        llm=get_llm()
     )
-    
+
     # Create the task
     task = Task(
-        description=f"Research this topic: {topic}. Provide useful information and examples.",
+        description="Research this topic: {topic}. Provide useful information and examples.",
         expected_output="A helpful report about the topic",
         agent=researcher
     )
-    
-    # Run the research
-    crew = Crew(agents=[researcher], tasks=[task])
-    result = crew.kickoff()
-    
-    return str(result)
 
+    return Crew(agents=[researcher], tasks=[task])
+
+
+def build_blog_crew():
+    """Blog team template; {topic} is filled in at kickoff"""
+    from crewai import Agent, Task, Crew
 
-def blog_team(topic):
-    """Simple blog creation function"""
-    
     # Create the agents
     researcher = Agent(
         role='Researcher',
         goal='Find information about topics',
         backstory='You research topics to help writers.',
-        llm=llm
+        llm=get_llm()
     )
-    
+
     writer = Agent(
         role='Writer',
         goal='Write good blog posts',
         backstory='You write clear and interesting blog posts.',
-        llm=llm
+        llm=get_llm()
     )
-    
+
     editor = Agent(
         role='Editor',
         goal='Make writing better',
         backstory='You fix grammar and make writing clearer.',
-        llm=llm
+        llm=get_llm()
     )
-    
+
     # Create the tasks
     research_task = Task(
-        description=f"Research information about: {topic}",
+        description="Research information about: {topic}",
         expected_output="Research findings",
         agent=researcher
     )
-    
+
     write_task = Task(
-        description=f"Write a blog post about: {topic}",
+        description="Write a blog post about: {topic}",
         expected_output="A blog post",
         agent=writer
     )
-    
+
     edit_task = Task(
         description="Edit the blog post to make it better",
         expected_output="Final blog post",
         agent=editor
     )
-    
-    # Run the team
-    crew = Crew(
+
+    return Crew(
         agents=[researcher, writer, editor],
         tasks=[research_task, write_task, edit_task]
     )
-    
-    result = crew.kickoff()
-    return str(result)
 
 
+def build_facet_crew():
+    """One researcher covering a single facet; {topic} and {facet} are filled in at kickoff"""
+    from crewai import Agent, Task, Crew
+
+    researcher = Agent(
+        role='Researcher',
+        goal='Find information about one aspect of a topic',
+        backstory='You research topics to help writers.',
+        llm=get_llm()
+    )
+
+    research_task = Task(
+        description="Research this aspect of {topic}: {facet}. Give concise findings with examples.",
+        expected_output="Research findings for this aspect",
+        agent=researcher
+    )
+
+    return Crew(agents=[researcher], tasks=[research_task])
+
+
+def build_writing_crew():
+    """Writer + editor working from finished research; {topic} and {research} are filled in at kickoff"""
+    from crewai import Agent, Task, Crew, Process
+
+    writer = Agent(
+        role='Writer',
+        goal='Write good blog posts',
+        backstory='You write clear and interesting blog posts.',
+        llm=get_llm()
+    )
+
+    editor = Agent(
+        role='Editor',
+        goal='Make writing better',
+        backstory='You fix grammar and make writing clearer.',
+        llm=get_llm()
+    )
+
+    write_task = Task(
+        description="Write a blog post about: {topic}\n\nUse this research:\n{research}",
+        expected_output="A blog post",
+        agent=writer
+    )
+
+    edit_task = Task(
+        description="Edit the blog post to make it better",
+        expected_output="Final blog post",
+        agent=editor
+    )
+
+    return Crew(
+        agents=[writer, editor],
+        tasks=[write_task, edit_task],
+        process=Process.sequential
+    )
+
+
+class CrewPool:
+    """Crews built from a template and reused across calls.
+
+    A crew is only used by one run at a time (kickoff fills the task
+    descriptions in place), so concurrent runs take different instances;
+    the pool grows to the peak number of concurrent runs and no further.
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self._idle = queue.SimpleQueue()
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self.build()
+
+    def kickoff(self, inputs, monitor=None):
+        crew = self._checkout()
+        if monitor is not None:
+            monitor.attach(crew)
+        try:
+            return crew.kickoff(inputs=inputs)
+        finally:
+            self._idle.put(crew)
+
+    async def kickoff_async(self, inputs, monitor=None):
+        crew = self._checkout()
+        if monitor is not None:
+            monitor.attach(crew)
+        try:
+            return await crew.kickoff_async(inputs=inputs)
+        finally:
+            self._idle.put(crew)
+
+
+class ResultCache:
+    """Thread-safe cache of finished results with a TTL"""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._data = {}  # key -> (result, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            result, expires_at = entry
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            return result
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def set(self, key, result):
+        with self._lock:
+            now = time.time()
+            self._data = {k: v for k, v in self._data.items() if v[1] >= now}  # drop expired
+            self._data[key] = (result, now + self.ttl)
+
+
+# Templates instantiated once per process
+research_crews = CrewPool(build_research_crew)
+blog_crews = CrewPool(build_blog_crew)
+facet_crews = CrewPool(build_facet_crew)
+writing_crews = CrewPool(build_writing_crew)
+results = ResultCache(CACHE_TTL)
+
+
+def _cache_key(kind, topic):
+    return (kind, " ".join(topic.lower().split()))  # same topic regardless of case/spacing
+
+
+def _run_cached(kind, crews, topic, on_event=None):
+    key = _cache_key(kind, topic)
+    result = results.get(key)
+    if result is None:
+        monitor = CrewMonitor(max_tokens=TOKEN_BUDGETS[kind], on_event=on_event)
+        result = str(crews.kickoff({"topic": topic}, monitor))
+        results.set(key, result)
+    return result
+
+
+def research_agent(topic, on_event=None):
+    """Simple research function (results are cached per topic).
+
+    on_event(event) receives each agent's output, time and tokens as it finishes
+    (see monitoring.py); the run stops if it goes over TOKEN_BUDGETS["research"].
+    """
+    return _run_cached("research", research_crews, topic, on_event)
+
+
+def blog_team(topic, on_event=None):
+    """Simple blog creation function (results are cached per topic); on_event as in research_agent"""
+    return _run_cached("blog", blog_crews, topic, on_event)
+
+
+async def ablog_team(topic, facets=FACETS, on_event=None):
+    """Async blog creation: facets are researched concurrently, then written and edited.
+
+    Shares the result cache and the "blog" token budget with blog_team.
+    """
+    key = _cache_key("blog", topic)
+    result = results.get(key)
+    if result is not None:
+        return result
+
+    monitor = CrewMonitor(max_tokens=TOKEN_BUDGETS["blog"], on_event=on_event)
+    findings = await asyncio.gather(
+        *(facet_crews.kickoff_async({"topic": topic, "facet": facet}, monitor) for facet in facets)
+    )
+    research = "\n\n".join(f"## {facet}\n{finding}" for facet, finding in zip(facets, findings, strict=True))
+    result = str(await writing_crews.kickoff_async({"topic": topic, "research": research}, monitor))
+    results.set(key, result)
+    return result
+
+
+async def _timed_blog(topic, semaphore):
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            return {"topic": topic, "result": await ablog_team(topic), "error": None,
+                    "seconds": time.perf_counter() - start}
+        except Exception as e:
+            return {"topic": topic, "result": None, "error": f"{type(e).__name__}: {e}",
+                    "seconds": time.perf_counter() - start}
+
+
+async def ablog_batch(topics, concurrency=4):
+    """Create blog posts for many topics, at most `concurrency` at a time.
+
+    Returns one dict per topic, in input order: topic, result, error, seconds (end-to-end latency).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(_timed_blog(topic, semaphore) for topic in topics))
+
+
+def blog_batch(topics, concurrency=4):
+    """Sync wrapper around ablog_batch"""
+    return asyncio.run(ablog_batch(topics, concurrency))
@@ -0,0 +1,58 @@
+# benchmark_crews.py
+#
+# End-to-end latency of the blog crews (makes real Gemini calls):
+#   sequential  - blog_team(): researcher -> writer -> editor, one after another
+#   parallel    - ablog_team(): facets researched concurrently, then writer -> editor
+#   batch       - blog_batch(): all topics at once, at most --concurrency in flight
+# The result cache is cleared before each mode so every run does the full work.
+#
+# Usage: python benchmark_crews.py "Future of remote work" "Benefits of AI" --concurrency 4
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import agents
+
+
+def report(name, latencies, elapsed):
+    print(f"{name:10} total {elapsed:7.1f}s | per topic median {statistics.median(latencies):6.1f}s, "
+          f"max {max(latencies):6.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency benchmark for the blog crews")
+    parser.add_argument("topics", nargs="+")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    agents.results.clear()
+    latencies = []
+    start = time.perf_counter()
+    for topic in args.topics:
+        t = time.perf_counter()
+        agents.blog_team(topic)
+        latencies.append(time.perf_counter() - t)
+    report("sequential", latencies, time.perf_counter() - start)
+
+    agents.results.clear()
+    latencies = []
+    start = time.perf_counter()
+    for topic in args.topics:
+        t = time.perf_counter()
+        asyncio.run(agents.ablog_team(topic))
+        latencies.append(time.perf_counter() - t)
+    report("parallel", latencies, time.perf_counter() - start)
+
+    agents.results.clear()
+    start = time.perf_counter()
+    batch = agents.blog_batch(args.topics, args.concurrency)
+    report("batch", [r["seconds"] for r in batch], time.perf_counter() - start)
+    for r in batch:
+        if r["error"]:
+            print(f"  {r['topic']}: {r['error']}")
+
+
+if __name__ == "__main__":
+    main()
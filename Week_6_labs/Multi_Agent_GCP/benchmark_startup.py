@@ -0,0 +1,81 @@
+# benchmark_startup.py
+#
+# Startup profile for the container: how long a fresh interpreter takes to import
+# the modules main.py loads before the first page renders, and which imports
+# dominate (python -X importtime). Each run is a new process.
+#
+# --check makes it usable as a startup regression test: it exits non-zero if a
+# heavy module (crewai, litellm) is imported at startup or the median import
+# time exceeds --max-ms.
+#
+# Usage: python benchmark_startup.py [--runs 5] [--module agents] [--top 10] [--check --max-ms 500]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Must not be imported until the first crew actually runs
+HEAVY_MODULES = ("crewai", "litellm")
+
+
+def time_import(module):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=HERE, check=True)
+    return time.perf_counter() - start
+
+
+def import_profile(module):
+    """Parse `python -X importtime` output: [(cumulative microseconds, module name)]"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=HERE, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative), name.strip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup-time profile for the agents app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--module", default="agents")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--check", action="store_true", help="fail on heavy imports or slow startup")
+    parser.add_argument("--max-ms", type=float, default=500)
+    args = parser.parse_args()
+
+    times = [time_import(args.module) for _ in range(args.runs)]
+    median_ms = statistics.median(times) * 1000
+    print(f"import {args.module}: median {median_ms:.0f} ms, "
+          f"min {min(times) * 1000:.0f} ms over {args.runs} runs (includes interpreter start)")
+
+    profile = import_profile(args.module)
+    print("\nSlowest imports (cumulative):")
+    for cumulative, name in sorted(profile, reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    if args.check:
+        heavy = sorted({name for _, name in profile if name.split(".")[0] in HEAVY_MODULES})
+        failures = []
+        if heavy:
+            failures.append(f"heavy modules imported at startup: {', '.join(heavy[:5])}")
+        if median_ms > args.max_ms:
+            failures.append(f"median import time {median_ms:.0f} ms > {args.max_ms:.0f} ms")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if failures:
+            sys.exit(1)
+        print("OK: startup profile within limits")
+
+
+if __name__ == "__main__":
+    main()
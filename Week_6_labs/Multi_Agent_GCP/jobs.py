@@ -0,0 +1,131 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Background job runner for crew runs.
+# Jobs are recorded in a SQLite table and executed on a thread pool, so the
+# Streamlit script thread only submits and polls. A job keeps running (and its
+# result stays available by id) even if the user who started it leaves the page.
+# While a job runs, each agent's finished output is stored as an event (so the
+# page can show it before the whole crew is done) and the latest step as `progress`.
+#
+# Job status: queued -> running -> done | failed
+
+DB_PATH = os.getenv("CREW_JOBS_DB", "jobs.db")
+WORKERS = int(os.getenv("CREW_WORKERS", "4"))
+
+
+class JobRunner:
+    """Runs functions(topic, on_event=...) in the background; one row per job in SQLite"""
+
+    def __init__(self, functions, db_path=DB_PATH, workers=WORKERS):
+        self.functions = functions  # kind -> callable(topic, on_event) returning a string
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crew-job")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, kind TEXT NOT NULL, topic TEXT NOT NULL,"
+            " status TEXT NOT NULL, result TEXT, error TEXT, progress TEXT,"
+            " created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "progress" not in columns:  # table created by an older version
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN progress TEXT")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_events ("
+            " job_id TEXT NOT NULL, seq INTEGER NOT NULL, event TEXT NOT NULL,"
+            " PRIMARY KEY (job_id, seq))"
+        )
+        # Jobs left unfinished by a previous process will never complete
+        self._conn.execute(
+            "UPDATE jobs SET status = 'failed', error = 'interrupted by restart', finished_at = ?"
+            " WHERE status IN ('queued', 'running')",
+            (time.time(),),
+        )
+        self._conn.commit()
+
+    def submit(self, kind, topic):
+        """Queue a job and return its id; an identical unfinished job is reused instead"""
+        if kind not in self.functions:
+            raise ValueError(f"Unknown job kind: {kind}")
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM jobs WHERE kind = ? AND lower(topic) = lower(?)"
+                " AND status IN ('queued', 'running') ORDER BY created_at LIMIT 1",
+                (kind, topic),
+            ).fetchone()
+            if row:
+                return row[0]
+            job_id = uuid.uuid4().hex
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, topic, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+                (job_id, kind, topic, time.time()),
+            )
+            self._conn.commit()
+        self._pool.submit(self._run, job_id, kind, topic)
+        return job_id
+
+    def get(self, job_id):
+        """Job row as a dict (with `elapsed` seconds), or None for an unknown id"""
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            row = cursor.fetchone()
+            columns = [c[0] for c in cursor.description]
+        if row is None:
+            return None
+        job = dict(zip(columns, row, strict=True))
+        job["elapsed"] = (job["finished_at"] or time.time()) - (job["started_at"] or job["created_at"])
+        return job
+
+    def events(self, job_id, after=0):
+        """Events recorded for a job (agent outputs with time and tokens), oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT event FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after),
+            ).fetchall()
+        return [json.loads(event) for (event,) in rows]
+
+    def recent(self, limit=20):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self.get(job_id) for (job_id,) in rows]
+
+    def _update(self, job_id, **fields):
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def _record_event(self, job_id, event):
+        if event["type"] == "step":
+            self._update(job_id, progress=f"{event['agent']} is working (step {event['steps']}, {event['tokens']} tokens so far)")
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO job_events (job_id, seq, event)"
+                " SELECT ?, COALESCE(MAX(seq), 0) + 1, ? FROM job_events WHERE job_id = ?",
+                (job_id, json.dumps(event), job_id),
+            )
+            self._conn.commit()
+
+    def _run(self, job_id, kind, topic):
+        self._update(job_id, status="running", started_at=time.time())
+        try:
+            result = self.functions[kind](topic, on_event=lambda event: self._record_event(job_id, event))
+        except Exception as e:
+            self._update(job_id, status="failed", error=str(e), finished_at=time.time())
+        else:
+            self._update(job_id, status="done", result=str(result), finished_at=time.time())
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._conn.close()
@@ -1,54 +1,122 @@
 import streamlit as st
 import os
-from agents import research_agent, blog_team
+from agents import api_key_configured, research_agent, blog_team
+from jobs import JobRunner
 
 # Simple page setup
 st.set_page_config(page_title="AI Agents", page_icon="🤖")
 
+
+@st.cache_resource
+def get_runner():
+    """One background job runner per server process, shared by every user"""
+    return JobRunner({"research": research_agent, "blog": blog_team})
+
+
+runner = get_runner()
+
 # Title
 st.title("🤖 AI Agents")
 st.write("Use AI agents to research topics or create blog posts")
 
 # Get API key
 st.sidebar.header("Setup")
-st.sidebar.success("API Key Ready!")
+if api_key_configured():
+    st.sidebar.success("API Key Ready!")
+else:
+    st.sidebar.error("GOOGLE_API_KEY is not set. Add it to your environment or .env file.")
+
+
+FINISHED = ("done", "failed")
+
+
+def show_job(kind):
+    """Show the current job of this kind; poll it only while it is unfinished"""
+    job_id = st.session_state.get(f"job_{kind}")
+    job = runner.get(job_id) if job_id else None
+    if job is None:
+        return
+    if job["status"] in FINISHED:
+        render_job(job)
+    else:
+        poll_job(job["id"])
+
+
+@st.fragment(run_every=2)
+def poll_job(job_id):
+    """Only this part of the page reruns while the job is working"""
+    job = runner.get(job_id)
+    if job["status"] in FINISHED:
+        st.rerun()  # whole page, so the finished job is shown without the timer
+    render_job(job)
+
+
+def render_job(job):
+    if job["status"] == "queued":
+        st.info(f"⏳ Waiting to start: {job['topic']}")
+    elif job["status"] == "running":
+        st.info(f"⚙️ Working on: {job['topic']} ({job['elapsed']:.0f}s)")
+        if job["progress"]:
+            st.caption(job["progress"])
+    elif job["status"] == "failed":
+        st.error(f"Error: {job['error']}")
+    else:
+        st.success(f"Done! ({job['elapsed']:.0f}s)")
+
+    # Each agent's output appears as soon as that agent finishes
+    outputs = [e for e in runner.events(job["id"]) if e["type"] == "output"]
+    for event in outputs:
+        label = f"{event['agent']} · {event['seconds']:.0f}s · {event['tokens_in']} in / {event['tokens_out']} out tokens"
+        with st.expander(label, expanded=job["status"] != "done" and event is outputs[-1]):
+            st.write(event["text"])
+
+    if job["status"] == "done":
+        st.write(job["result"])
+        if outputs:
+            st.caption(f"Total: {sum(e['tokens_in'] + e['tokens_out'] for e in outputs)} tokens")
+    st.caption(f"Job id: {job['id']} — bookmark this page to come back to the result")
+
+
+def start_job(kind, topic):
+    job_id = runner.submit(kind, topic)
+    st.session_state[f"job_{kind}"] = job_id
+    st.query_params["job"] = job_id
+
+
+# Returning with ?job=<id> shows that job's result
+if "job" in st.query_params:
+    linked = runner.get(st.query_params["job"])
+    if linked:
+        st.session_state.setdefault(f"job_{linked['kind']}", linked["id"])
 
 # Choose what to do
-option = st.radio("What do you want to do?", 
+option = st.radio("What do you want to do?",
                   ["Research a topic", "Create a blog post"])
 
 if option == "Research a topic":
     st.header("Research Agent")
-    
-    topic = st.text_input("What topic do you want to research?", 
+
+    topic = st.text_input("What topic do you want to research?",
                          value="Benefits of AI")
-    
+
     if st.button("Start Research"):
         if topic:
-            with st.spinner("Researching..."):
-                try:
-                    result = research_agent(topic)
-                    st.success("Done!")
-                    st.write(result)
-                except Exception as e:
-                    st.error(f"Error: {e}")
+            start_job("research", topic)
         else:
             st.warning("Please enter a topic")
 
+    show_job("research")
+
 else:  # Create blog post
     st.header("Blog Creation Team")
-    
-    topic = st.text_input("What should the blog post be about?", 
+
+    topic = st.text_input("What should the blog post be about?",
                          value="Future of remote work")
-    
+
     if st.button("Create Blog Post"):
         if topic:
-            with st.spinner("Creating blog post..."):
-                try:
-                    result = blog_team(topic)
-                    st.success("Done!")
-                    st.write(result)
-                except Exception as e:
-                    st.error(f"Error: {e}")
+            start_job("blog", topic)
         else:
-            st.warning("Please enter a topic")
\ No newline at end of file
+            st.warning("Please enter a topic")
+
+    show_job("blog")
@@ -0,0 +1,144 @@
+import threading
+import time
+
+# Per-agent token/latency accounting and token budgets for crew runs,
+# collected through CrewAI's callbacks:
+#   - step_callback (after every agent step): checks the run's token budget and
+#     stops the crew by raising TokenBudgetExceeded once it is spent
+#   - task_callback (after every task): reports that agent's output, time and
+#     tokens to `on_event` as soon as it is ready, so the UI can show it
+#
+# Tokens are read the way CrewAI fills crew.usage_metrics: from the agent's LLM
+# (get_token_usage_summary) for native providers, otherwise from the agent's own
+# _token_process. All agents share one LLM (get_llm is cached), so usage is taken
+# as a delta over the whole run rather than per agent; while nothing has been
+# measured (no usage recorded yet) tokens are estimated from text length.
+
+
+class TokenBudgetExceeded(RuntimeError):
+    pass
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token)"""
+    return max(1, len(text) // 4) if text else 0
+
+
+def _usage_source(agent):
+    """The object CrewAI records this agent's token usage on, or None"""
+    llm = getattr(agent, "llm", None)
+    if hasattr(llm, "get_token_usage_summary"):
+        return llm
+    return getattr(agent, "_token_process", None)
+
+
+def _read_usage(source):
+    """(prompt tokens, completion tokens) recorded on a usage source so far"""
+    if hasattr(source, "get_token_usage_summary"):
+        summary = source.get_token_usage_summary()
+    else:
+        summary = source.get_summary()
+    return summary.prompt_tokens or 0, summary.completion_tokens or 0
+
+
+class CrewMonitor:
+    """Tracks one run (one or more crews); attach() each crew before its kickoff"""
+
+    def __init__(self, max_tokens=None, on_event=None):
+        self.max_tokens = max_tokens or None  # None/0: no budget
+        self.on_event = on_event
+        self.outputs = []  # one entry per finished task
+        self._sources = {}  # id(usage source) -> (source, tokens before this run)
+        self._reported = (0, 0)  # measured tokens already reported in outputs
+        self._steps = {}
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    def attach(self, crew):
+        """Point a crew's callbacks at this monitor (pooled crews are re-attached on every run)"""
+        started = {"at": time.perf_counter()}  # when the crew's current task began
+        callback = lambda output: self._task_done(output, started)
+        crew.task_callback = callback
+        # kickoff only copies task_callback to tasks without a callback, so a pooled
+        # crew's tasks would keep the first run's monitor; set them directly
+        for task in crew.tasks:
+            task.callback = callback
+        for agent in crew.agents:
+            agent.step_callback = lambda step, agent=agent: self._step(agent)
+            source = _usage_source(agent)
+            if source is None:
+                continue
+            with self._lock:
+                if id(source) not in self._sources:
+                    self._sources[id(source)] = (source, _read_usage(source))
+
+    def _measured(self):
+        """(prompt, completion) tokens recorded on the attached usage sources since attach"""
+        tokens_in = tokens_out = 0
+        for source, (base_in, base_out) in list(self._sources.values()):
+            used_in, used_out = _read_usage(source)
+            tokens_in += used_in - base_in
+            tokens_out += used_out - base_out
+        return tokens_in, tokens_out
+
+    def tokens_used(self):
+        """Tokens used by this run so far (estimated from finished outputs while nothing is measured)"""
+        measured = sum(self._measured())
+        if measured > 0:
+            return measured
+        return sum(e["tokens_in"] + e["tokens_out"] for e in self.outputs)
+
+    def _step(self, agent):
+        with self._lock:
+            self._steps[agent.role] = self._steps.get(agent.role, 0) + 1
+            steps = self._steps[agent.role]
+        used = self.tokens_used()
+        self._emit({"type": "step", "agent": agent.role, "steps": steps, "tokens": used})
+        if self.max_tokens and used > self.max_tokens:
+            raise TokenBudgetExceeded(
+                f"Token budget of {self.max_tokens} exceeded while {agent.role} was working"
+            )
+
+    def _task_done(self, output, started):
+        now = time.perf_counter()
+        seconds, started["at"] = now - started["at"], now
+        measured = self._measured()
+        with self._lock:
+            # usage since the previous report is this task's (crews in a run share the LLM);
+            # a zero delta means nothing was recorded, so fall back to an estimate
+            tokens_in = measured[0] - self._reported[0]
+            tokens_out = measured[1] - self._reported[1]
+            if tokens_in + tokens_out > 0:
+                self._reported = measured
+            else:
+                tokens_in, tokens_out = estimate_tokens(output.description), estimate_tokens(output.raw)
+
+            entry = {
+                "type": "output",
+                "agent": output.agent,
+                "text": output.raw,
+                "seconds": seconds,
+                "tokens_in": tokens_in,
+                "tokens_out": tokens_out,
+            }
+            self.outputs.append(entry)
+        self._emit(entry)
+
+    def _emit(self, event):
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def summary(self):
+        """Per-agent totals (seconds, tokens in/out) plus the whole run"""
+        agents = {}
+        for entry in self.outputs:
+            totals = agents.setdefault(entry["agent"], {"tasks": 0, "seconds": 0.0, "tokens_in": 0, "tokens_out": 0})
+            totals["tasks"] += 1
+            for field in ("seconds", "tokens_in", "tokens_out"):
+                totals[field] += entry[field]
+        return {
+            "agents": agents,
+            "seconds": time.perf_counter() - self.started,
+            "tokens": sum(e["tokens_in"] + e["tokens_out"] for e in self.outputs),
+            "max_tokens": self.max_tokens,
+        }
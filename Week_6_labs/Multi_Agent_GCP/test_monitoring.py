@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import pytest
+
+from monitoring import CrewMonitor, TokenBudgetExceeded
+
+
+class FakeLLM:
+    """Stands in for a CrewAI BaseLLM: usage is recorded on the LLM, not the agent"""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def call(self, prompt_tokens, completion_tokens):
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+
+    def get_token_usage_summary(self):
+        return SimpleNamespace(prompt_tokens=self.prompt_tokens, completion_tokens=self.completion_tokens)
+
+
+def make_crew(llm, *roles):
+    agents = [SimpleNamespace(role=role, llm=llm, step_callback=None) for role in roles]
+    tasks = [SimpleNamespace(callback=None) for _ in roles]
+    return SimpleNamespace(agents=agents, tasks=tasks, task_callback=None)
+
+
+def finish(crew, agent, raw="done"):
+    crew.tasks[0].callback(SimpleNamespace(agent=agent.role, description="task", raw=raw))
+
+
+def test_budget_raises_on_llm_usage():
+    llm = FakeLLM()
+    crew = make_crew(llm, "Researcher")
+    monitor = CrewMonitor(max_tokens=100)
+    monitor.attach(crew)
+    agent = crew.agents[0]
+
+    llm.call(600, 200)
+    with pytest.raises(TokenBudgetExceeded):
+        agent.step_callback(None)
+    assert monitor.tokens_used() == 800
+
+
+def test_outputs_report_deltas_of_shared_llm():
+    llm = FakeLLM()
+    llm.call(50, 50)  # an earlier run on the same (cached) LLM
+    crew = make_crew(llm, "Researcher", "Writer")
+    events = []
+    monitor = CrewMonitor(on_event=events.append)
+    monitor.attach(crew)
+    researcher, writer = crew.agents
+
+    llm.call(300, 100)
+    finish(crew, researcher)
+    llm.call(200, 50)
+    finish(crew, writer)
+
+    outputs = [(e["agent"], e["tokens_in"], e["tokens_out"]) for e in events if e["type"] == "output"]
+    assert outputs == [("Researcher", 300, 100), ("Writer", 200, 50)]
+    assert monitor.summary()["tokens"] == 650
+
+
+def test_estimates_when_nothing_is_measured():
+    crew = make_crew(FakeLLM(), "Researcher")
+    monitor = CrewMonitor(max_tokens=10)
+    monitor.attach(crew)
+
+    finish(crew, crew.agents[0], raw="x" * 400)
+    assert monitor.outputs[0]["tokens_out"] == 100
+    assert monitor.tokens_used() == 101
+    with pytest.raises(TokenBudgetExceeded):
+        crew.agents[0].step_callback(None)
+
+
+def test_token_process_fallback():
+    process = FakeLLM()
+    agent = SimpleNamespace(role="Researcher", llm="gemini/gemini-2.0-flash", step_callback=None,
+                            _token_process=SimpleNamespace(get_summary=process.get_token_usage_summary))
+    crew = SimpleNamespace(agents=[agent], tasks=[SimpleNamespace(callback=None)], task_callback=None)
+    monitor = CrewMonitor()
+    monitor.attach(crew)
+
+    process.call(40, 10)
+    assert monitor.tokens_used() == 50
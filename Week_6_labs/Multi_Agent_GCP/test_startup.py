@@ -0,0 +1,13 @@
+import pytest
+
+from benchmark_startup import HEAVY_MODULES, import_profile
+
+
+@pytest.mark.parametrize("module, requires", [("agents", "dotenv"), ("main", "streamlit")])
+def test_startup_does_not_import_heavy_modules(module, requires):
+    # The import runs in a fresh interpreter, so modules this test process already loaded don't hide anything
+    pytest.importorskip(requires)
+    profile = import_profile(module)
+    assert any(name == module for _, name in profile)
+    heavy = sorted({name for _, name in profile if name.split(".")[0] in HEAVY_MODULES})
+    assert heavy == []
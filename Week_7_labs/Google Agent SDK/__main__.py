@@ -4,66 +4,52 @@
 # PURPOSE: Sets up and runs the A2A server with multi-skill agent
 #
 # FUNCTIONALITY:
-# - Defines two skills: Greeting and Quote
-# - Creates agent card advertising both skills
-# - Configures DefaultRequestHandler with MultiSkillAgentExecutor
-# - Starts Uvicorn server on port 9999
+# - Starts Uvicorn on port 9999 with the app factory in app.py
+#   (agent card, request handler, task store, logging)
+# - Optional multiple worker processes (--workers or A2A_WORKERS)
+# - Uses uvloop and httptools automatically when they are installed
 #
-# USAGE: uv run . 
+# USAGE: uv run .
+#        uv run . --workers 4 --port 9999
 # ================================================================
+import argparse
+import importlib.util
+import os
+
 import uvicorn
-from a2a.server.apps import A2AStarletteApplication
-from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
-from a2a.types import AgentCapabilities, AgentCard, AgentSkill
-from agent_executor import MultiSkillAgentExecutor
+from app import build_agent_card
 
 
 def main():
-    # Define both skills
-    greeting_skill = AgentSkill(
-        id="hello_world",
-        name="Greet",
-        description="Return a friendly greeting",
-        tags=["greeting", "hello", "world"],
-        examples=["Hey", "Hello", "Hi"],
-    )
-    
-    quote_skill = AgentSkill(
-        id="quote", 
-        name="Get Quote",
-        description="Return a motivational quote",
-        tags=["quote", "motivation", "inspiration"],
-        examples=["Inspire me", "Give me a quote", "Motivate me"],
-    )
+    parser = argparse.ArgumentParser(description="Multi-Skill A2A agent server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9999)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("A2A_WORKERS", "1")))
+    parser.add_argument("--public-url", default=None, help="URL advertised in the agent card")
+    args = parser.parse_args()
 
-    agent_card = AgentCard(
-        name="Multi-Skill Agent",
-        description="An agent that can greet and provide motivational quotes",
-        url="http://localhost:9999/",
-        defaultInputModes=["text"],
-        defaultOutputModes=["text"],
-        skills=[greeting_skill, quote_skill],  # Both skills in one agent
-        version="1.0.0",
-        capabilities=AgentCapabilities(),
-    )
+    # Worker processes build their own app, so pass settings through the environment
+    os.environ["A2A_WORKERS"] = str(args.workers)
+    os.environ["A2A_PUBLIC_URL"] = args.public_url or f"http://localhost:{args.port}/"
 
-    request_handler = DefaultRequestHandler(
-        agent_executor=MultiSkillAgentExecutor(),  # Single executor handles both
-        task_store=InMemoryTaskStore(),
-    )
-
-    server = A2AStarletteApplication(
-        http_handler=request_handler,
-        agent_card=agent_card,
-    )
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
 
     print("Starting Multi-Skill Agent with skills:")
-    for skill in agent_card.skills:
+    for skill in build_agent_card().skills:
         print(f"  - {skill.name} (id: {skill.id})")
-
-    uvicorn.run(server.build(), host="0.0.0.0", port=9999)
+    print(f"Workers: {args.workers} | loop: {loop} | http: {http}")
+
+    uvicorn.run(
+        "app:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=loop,
+        http=http,
+    )
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -6,78 +6,208 @@
 # COMPONENTS:
 # - GreetingAgent: Returns friendly greetings
 # - QuoteAgent: Returns motivational quotes
-# - MultiSkillAgentExecutor: Routes messages based on keywords
+# - registry: SkillRegistry holding both skills (card entry + handler)
+# - MultiSkillAgentExecutor: Routes messages based on keywords and
+#   streams the chosen skill's output
 #
 # ROUTING LOGIC:
-# - Greeting keywords: "hello", "hi", "hey", "greet", "greeting"
-# - Quote keywords: "quote", "inspire", "motivate", "motivation", "inspiration"
+# - Greeting (hello_world): tags "greeting", "hello", "world" + "hi", "hey", "greet"
+# - Quote (quote): tags "quote", "motivation", "inspiration" + "inspire", "motivate"
+# - Quote wins when both match (higher priority)
 # - Default: Falls back to greeting for unrecognized messages
 #
-# ARCHITECTURE: Single executor pattern with keyword-based message routing
+# ARCHITECTURE: Single executor pattern; each skill registers once in the
+# SkillRegistry, and the executor compiles the card skills' tags into one
+# SkillRouter automaton (see skill_router.py) used as the dispatch table
+#
+# STREAMING & CANCELLATION:
+# - Each request becomes a task; every chunk a skill yields is enqueued as a
+#   "working" status update, then the full text is added as an artifact and
+#   the task completes
+# - cancel() cancels the running skill coroutine (CancelledError is raised at
+#   its next await) and marks the task as canceled
+# - With several worker processes, a cancel can reach a worker that is not
+#   running the job; it only marks the task canceled in the shared store.
+#   Given that store (task_store=...), the worker running the job checks it
+#   between chunks and before completing, and stops without overwriting it
+#
+# OBSERVABILITY: structured logs and parse/route/invoke spans via tracing.py
+# (A2A_LOG_LEVEL=DEBUG for per-message logs, A2A_TRACE_FILE to export spans)
 # ================================================================
+import asyncio
+import inspect
+import logging
+
 from a2a.server.agent_execution import AgentExecutor
 from a2a.server.agent_execution.context import RequestContext
 from a2a.server.events.event_queue import EventQueue
-from a2a.utils import new_agent_text_message
+from a2a.server.tasks import TaskUpdater
+from a2a.types import Part, TaskState, TextPart
+from a2a.utils import new_agent_text_message, new_task
 from pydantic import BaseModel
+from skill_registry import SkillRegistry
+from tracing import LOGGER_NAME, tracer
+
+logger = logging.getLogger(LOGGER_NAME)
 
 
 class GreetingAgent(BaseModel):
     """Greeting agent that returns a greeting"""
 
-    async def invoke(self) -> str:
+    async def invoke(self, message: str = "") -> str:
         return "Hello! I'm your friendly greeting agent. Nice to meet you!"
 
+    async def stream(self, message: str = ""):
+        for chunk in ["Hello! ", "I'm your friendly greeting agent. ", "Nice to meet you!"]:
+            await asyncio.sleep(0)  # cancellation point between chunks
+            yield chunk
+
 
 class QuoteAgent(BaseModel):
     """Quote agent that returns motivational quotes"""
 
-    async def invoke(self) -> str:
+    async def invoke(self, message: str = "") -> str:
         return "Believe in yourself. You are braver than you think, more talented than you know, and capable of more than you imagine!"
 
+    async def stream(self, message: str = ""):
+        for chunk in [
+            "Believe in yourself. ",
+            "You are braver than you think, ",
+            "more talented than you know, ",
+            "and capable of more than you imagine!",
+        ]:
+            await asyncio.sleep(0)  # cancellation point between chunks
+            yield chunk
+
+
+# Register each skill once: card metadata, handler and routing priority
+registry = SkillRegistry(default="hello_world")
+
+registry.register(
+    id="hello_world",
+    name="Greet",
+    description="Return a friendly greeting",
+    tags=["greeting", "hello", "world"],
+    examples=["Hey", "Hello", "Hi"],
+    keywords=["hi", "hey", "greet"],
+    handler=GreetingAgent().stream,
+)
+
+registry.register(
+    id="quote",
+    name="Get Quote",
+    description="Return a motivational quote",
+    tags=["quote", "motivation", "inspiration"],
+    examples=["Inspire me", "Give me a quote", "Motivate me"],
+    keywords=["inspire", "motivate"],
+    priority=1,
+    handler=QuoteAgent().stream,
+)
+
 
 class MultiSkillAgentExecutor(AgentExecutor):
-    """Single executor that handles both greeting and quote skills"""
+    """Single executor that dispatches to every skill in a SkillRegistry"""
 
-    def __init__(self):
-        self.greeting_agent = GreetingAgent()
-        self.quote_agent = QuoteAgent()
+    def __init__(self, skill_registry: SkillRegistry = registry, agent_skills: list = None, task_store=None):
+        # agent_skills: the AgentCard's skills; routing is built from their tags
+        self.registry = skill_registry
+        self.router = skill_registry.build_router(agent_skills)
+        self.running = {}  # task id -> asyncio.Task running the skill (this process only)
+        # Store shared with other worker processes, checked for cancels they handled
+        self.task_store = task_store
 
     async def execute(self, context: RequestContext, event_queue: EventQueue):
+        trace = tracer.start_trace("execute")
+        try:
+            await self._execute(context, event_queue, trace)
+        finally:
+            trace.finish()
+
+    async def _execute(self, context: RequestContext, event_queue: EventQueue, trace):
         # Get the message text to determine which skill to use
-        message_text = ""
-        if hasattr(context, 'message') and context.message and context.message.parts:
-            for part in context.message.parts:
-                if hasattr(part, 'text'):
-                    message_text += part.text
-                elif hasattr(part, 'root') and hasattr(part.root, 'text'):
-                    message_text += part.root.text
-        
-        message_text = message_text.lower().strip()
-        print(f"DEBUG: Received message: '{message_text}'")
-        
-        # Simple keyword-based routing
-        quote_keywords = ["quote", "inspire", "motivate", "motivation", "inspiration"]
-        greeting_keywords = ["hello", "hi", "hey", "greet", "greeting"]
-        
-        result = None
-        
-        # Check for quote keywords
-        if any(keyword in message_text for keyword in quote_keywords):
-            print("DEBUG: Routing to quote agent")
-            result = await self.quote_agent.invoke()
-        
-        # Check for greeting keywords or default to greeting
-        elif any(keyword in message_text for keyword in greeting_keywords) or not message_text:
-            print("DEBUG: Routing to greeting agent")
-            result = await self.greeting_agent.invoke()
-        
-        # Default fallback
+        with trace.span("parse") as span:
+            message_text = ""
+            if hasattr(context, 'message') and context.message and context.message.parts:
+                for part in context.message.parts:
+                    if hasattr(part, 'text'):
+                        message_text += part.text
+                    elif hasattr(part, 'root') and hasattr(part.root, 'text'):
+                        message_text += part.root.text
+
+            message_text = message_text.lower().strip()
+            span["message.length"] = len(message_text)
+        logger.debug("Received message", extra={"message_text": message_text})
+
+        # Keyword-based routing: one scan finds every matching skill, best first
+        with trace.span("route") as span:
+            matches = self.router.match(message_text)
+            skill_id = matches[0] if matches else self.router.default
+            span["skill.id"] = skill_id
+        if matches:
+            logger.debug("Routing to skill", extra={"skill_id": skill_id, "matches": matches})
         else:
-            print("DEBUG: No specific keywords found, defaulting to greeting")
-            result = await self.greeting_agent.invoke()
-        
-        event_queue.enqueue_event(new_agent_text_message(result))
+            logger.debug("No specific keywords found, using default skill", extra={"skill_id": skill_id})
+
+        task = context.current_task
+        if not task:
+            task = new_task(context.message)
+            event_queue.enqueue_event(task)
+        updater = TaskUpdater(event_queue, task.id, task.contextId)
+        trace.set(**{"task.id": task.id, "skill.id": skill_id})
+
+        # Run the skill in its own asyncio task so cancel() can interrupt it
+        job = asyncio.create_task(self._stream_skill(skill_id, message_text, task, updater))
+        self.running[task.id] = job
+        try:
+            with trace.span("invoke", **{"skill.id": skill_id}):
+                result = await job
+        except asyncio.CancelledError:
+            if job.cancelled() and task.id not in self.running:
+                logger.info("Task cancelled", extra={"task_id": task.id, "skill_id": skill_id})
+                trace.set(cancelled=True)
+                return  # cancelled through cancel(), which already reported it
+            raise
+        finally:
+            self.running.pop(task.id, None)
+
+        if result is None or await self._cancelled_elsewhere(task.id):
+            logger.info("Task cancelled by another worker", extra={"task_id": task.id, "skill_id": skill_id})
+            trace.set(cancelled=True)
+            return
+
+        # Artifact is named after the skill so clients can check routing
+        updater.add_artifact([Part(root=TextPart(text=result))], name=skill_id)
+        updater.complete()
+
+    async def _stream_skill(self, skill_id: str, message_text: str, task, updater: TaskUpdater) -> str | None:
+        # Handlers may return a string or be async generators yielding chunks;
+        # None means another worker cancelled the task
+        output = self.registry.handler(skill_id)(message_text)
+        if not inspect.isasyncgen(output):
+            return await output
+
+        chunks = []
+        async for chunk in output:
+            if await self._cancelled_elsewhere(task.id):
+                await output.aclose()
+                return None
+            chunks.append(chunk)
+            updater.update_status(
+                TaskState.working,
+                new_agent_text_message(chunk, task.contextId, task.id),
+            )
+        return "".join(chunks)
+
+    async def _cancelled_elsewhere(self, task_id: str) -> bool:
+        if self.task_store is None:
+            return False
+        stored = await self.task_store.get(task_id)
+        return stored is not None and stored.status.state == TaskState.canceled
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue):
-        raise Exception("Cancel not supported")
\ No newline at end of file
+        task_id = context.task_id
+        job = self.running.pop(task_id, None)
+        if job is not None:
+            job.cancel()
+        updater = TaskUpdater(event_queue, task_id, context.context_id)
+        updater.update_status(TaskState.canceled, final=True)
\ No newline at end of file
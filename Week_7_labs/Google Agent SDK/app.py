@@ -0,0 +1,111 @@
+# ================================================================
+# app.py - A2A Application Factory
+# ================================================================
+# PURPOSE: Builds the Starlette app for the multi-skill agent; uvicorn
+#          calls create_app() once per worker process
+#
+# FUNCTIONALITY:
+# - Creates agent card advertising every skill in the registry
+#   (Greeting and Quote, defined in agent_executor.py)
+# - Configures DefaultRequestHandler with MultiSkillAgentExecutor,
+#   routing from the same card skills
+# - Persists tasks in a bounded SQLite task store (tasks.db)
+# - Sets up queued JSON logging and optional span export (see tracing.py)
+# - Serves the agent card from pre-serialized bytes with ETag and
+#   Cache-Control, answering 304 when the client's copy is current
+#
+# CONFIGURATION (environment variables, set by __main__.py):
+# - A2A_PUBLIC_URL: URL advertised in the agent card
+# - A2A_WORKERS: number of worker processes sharing tasks.db. With more
+#   than one, the task store writes every save through and reads every
+#   task from SQLite (no per-process cache), and the executor watches the
+#   store for cancels handled by a sibling worker
+# ================================================================
+import contextlib
+import hashlib
+import json
+import os
+
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.types import AgentCapabilities, AgentCard
+from agent_executor import MultiSkillAgentExecutor, registry
+from sqlite_task_store import SQLiteTaskStore
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from tracing import setup_logging
+
+AGENT_CARD_PATH = "/.well-known/agent.json"
+CARD_MAX_AGE = 300  # seconds clients may reuse the card without revalidating
+
+
+def build_agent_card(url: str = None) -> AgentCard:
+    return AgentCard(
+        name="Multi-Skill Agent",
+        description="An agent that can greet and provide motivational quotes",
+        url=url or os.getenv("A2A_PUBLIC_URL", "http://localhost:9999/"),
+        defaultInputModes=["text"],
+        defaultOutputModes=["text"],
+        skills=registry.agent_skills(),  # Every registered skill in one agent
+        version="1.0.0",
+        capabilities=AgentCapabilities(streaming=True),
+    )
+
+
+def cached_card_route(agent_card: AgentCard) -> Route:
+    """Route serving the card from bytes serialized once, with ETag revalidation"""
+    body = json.dumps(agent_card.model_dump(mode="json", exclude_none=True)).encode()
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={CARD_MAX_AGE}"}
+
+    async def agent_card_endpoint(request: Request) -> Response:
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    return Route(AGENT_CARD_PATH, agent_card_endpoint, methods=["GET"])
+
+
+def create_app():
+    log_listener = setup_logging()
+    agent_card = build_agent_card()
+
+    # Tasks survive restarts; idle ones expire after a day. With several
+    # workers every save is written through and the LRU cache is off, so
+    # each process sees tasks updated by its siblings.
+    multi_worker = int(os.getenv("A2A_WORKERS", "1")) > 1
+    task_store = SQLiteTaskStore(
+        "tasks.db",
+        ttl_seconds=24 * 3600,
+        batch_size=1 if multi_worker else 100,
+        cache_size=0 if multi_worker else 1024,
+    )
+
+    request_handler = DefaultRequestHandler(
+        agent_executor=MultiSkillAgentExecutor(  # Single executor handles all
+            registry,
+            agent_card.skills,
+            # A cancel may land on another worker; the job then sees it in the store
+            task_store=task_store if multi_worker else None,
+        ),
+        task_store=task_store,
+    )
+
+    server = A2AStarletteApplication(
+        http_handler=request_handler,
+        agent_card=agent_card,
+    )
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        try:
+            yield
+        finally:
+            await task_store.close()  # flush buffered writes
+            log_listener.stop()  # drain queued log records
+
+    app = server.build(lifespan=lifespan)
+    # Matched before the SDK's own card route, which re-serializes on every request
+    app.router.routes.insert(0, cached_card_route(agent_card))
+    return app
@@ -0,0 +1,94 @@
+# ================================================================
+# benchmark_router.py - Routing Microbenchmark
+# ================================================================
+# PURPOSE: Compares the compiled SkillRouter against the original
+#          `any(keyword in text ...)` loop over every skill
+#
+# FUNCTIONALITY:
+# - Builds a synthetic registry (N skills x K keywords each)
+# - Checks both routers pick the same skill for every message
+# - Reports microseconds per routed message for each approach
+#
+# USAGE: python benchmark_router.py [--skills 50] [--keywords 20] [--messages 2000]
+# ================================================================
+import argparse
+import random
+import string
+import timeit
+
+from skill_router import SkillRouter
+
+
+def build_registry(num_skills: int, num_keywords: int, seed: int = 7):
+    rng = random.Random(seed)
+    registry = {}
+    for i in range(num_skills):
+        registry[f"skill_{i}"] = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+            for _ in range(num_keywords)
+        ]
+    return registry
+
+
+def build_messages(registry, num_messages: int, seed: int = 11):
+    rng = random.Random(seed)
+    keywords = [k for kws in registry.values() for k in kws]
+    filler = ["please", "can", "you", "give", "me", "some", "thing", "today", "now"]
+    messages = []
+    for _ in range(num_messages):
+        words = rng.choices(filler, k=rng.randint(3, 12))
+        if rng.random() < 0.7:  # most messages hit at least one skill
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        messages.append(" ".join(words))
+    return messages
+
+
+def naive_route(registry, text, default=None):
+    # The original routing: one linear keyword scan per skill, first match wins
+    for skill_id, keywords in registry.items():
+        if any(keyword in text for keyword in keywords):
+            return skill_id
+    return default
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SkillRouter routing microbenchmark")
+    parser.add_argument("--skills", type=int, default=50)
+    parser.add_argument("--keywords", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    registry = build_registry(args.skills, args.keywords)
+    messages = build_messages(registry, args.messages)
+
+    # Registration order == priority order, matching the naive loop's first-match rule
+    router = SkillRouter(default="none")
+    for priority, (skill_id, keywords) in enumerate(registry.items()):
+        router.register(skill_id, keywords, priority=-priority)
+    router.compile()
+
+    mismatches = sum(
+        naive_route(registry, m, "none") != router.route(m) for m in messages
+    )
+
+    def run_naive():
+        for m in messages:
+            naive_route(registry, m, "none")
+
+    def run_router():
+        for m in messages:
+            router.route(m)
+
+    naive = min(timeit.repeat(run_naive, number=1, repeat=args.repeat))
+    compiled = min(timeit.repeat(run_router, number=1, repeat=args.repeat))
+
+    print(f"Skills: {args.skills}  Keywords/skill: {args.keywords}  Messages: {args.messages}")
+    print(f"Routing mismatches: {mismatches}")
+    print(f"Naive any() loop : {naive / len(messages) * 1e6:8.2f} us/message")
+    print(f"SkillRouter      : {compiled / len(messages) * 1e6:8.2f} us/message")
+    print(f"Speedup          : {naive / compiled:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
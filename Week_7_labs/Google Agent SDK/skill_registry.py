@@ -0,0 +1,96 @@
+# ================================================================
+# skill_registry.py - Pluggable Skill Registry
+# ================================================================
+# PURPOSE: Single place where each skill declares its card entry and handler
+#
+# COMPONENTS:
+# - SkillRegistry: Holds every skill's AgentSkill (id, name, description,
+#   tags, examples), its async handler and routing priority
+#
+# FUNCTIONALITY:
+# - agent_skills(): AgentSkill list for the AgentCard
+# - build_router(): SkillRouter compiled from the card skills' tags
+#   (plus any extra routing keywords), so the card and router never drift
+# - handler(): Lookup table from skill id to handler
+#
+# USAGE:
+#   registry = SkillRegistry(default="hello_world")
+#
+#   @registry.skill(id="hello_world", name="Greet", description="...",
+#                   tags=["greeting", "hello"], examples=["Hi"])
+#   async def greet(message: str) -> str:
+#       return "Hello!"
+#
+# Handlers are either coroutine functions returning the full text or async
+# generator functions yielding chunks, which the executor streams.
+# ================================================================
+from typing import AsyncIterator, Awaitable, Callable, Union
+
+from a2a.types import AgentSkill
+from skill_router import SkillRouter
+
+SkillHandler = Callable[[str], Union[Awaitable[str], AsyncIterator[str]]]
+
+
+class SkillRegistry:
+    """Registry of skills: card metadata, handler and routing priority per skill id"""
+
+    def __init__(self, default: str = None):
+        self.default = default
+        self._skills = {}    # skill id -> AgentSkill
+        self._handlers = {}  # skill id -> handler
+        self._keywords = {}  # skill id -> extra routing keywords (beyond tags)
+        self._priority = {}  # skill id -> priority
+
+    def register(
+        self,
+        id: str,
+        name: str,
+        description: str,
+        tags: list,
+        handler: SkillHandler,
+        examples: list = None,
+        keywords: list = None,
+        priority: int = 0,
+    ) -> AgentSkill:
+        """Register a skill. `keywords` adds routing words that are not worth advertising as tags."""
+        if id in self._skills:
+            raise ValueError(f"Skill '{id}' is already registered")
+        skill = AgentSkill(
+            id=id,
+            name=name,
+            description=description,
+            tags=tags,
+            examples=examples or [],
+        )
+        self._skills[id] = skill
+        self._handlers[id] = handler
+        self._keywords[id] = list(keywords or [])
+        self._priority[id] = priority
+        return skill
+
+    def skill(self, **kwargs):
+        """Decorator form of register(): the decorated coroutine function is the handler."""
+        def decorator(handler: SkillHandler) -> SkillHandler:
+            self.register(handler=handler, **kwargs)
+            return handler
+        return decorator
+
+    def agent_skills(self) -> list:
+        return list(self._skills.values())
+
+    def handler(self, skill_id: str) -> SkillHandler:
+        return self._handlers[skill_id]
+
+    def build_router(self, agent_skills: list = None) -> SkillRouter:
+        """Compile a router from the card's skills (defaults to every registered skill)."""
+        router = SkillRouter(default=self.default)
+        for skill in agent_skills if agent_skills is not None else self.agent_skills():
+            if skill.id not in self._handlers:
+                raise ValueError(f"Agent card advertises skill '{skill.id}' with no registered handler")
+            router.register(
+                skill.id,
+                list(skill.tags or []) + self._keywords[skill.id],
+                priority=self._priority[skill.id],
+            )
+        return router.compile()
@@ -0,0 +1,112 @@
+# ================================================================
+# skill_router.py - Compiled Keyword Router
+# ================================================================
+# PURPOSE: Finds every skill whose keywords appear in a message in a single pass
+#
+# COMPONENTS:
+# - SkillRouter: Registry of skills and their keywords, compiled into
+#   one Aho-Corasick automaton
+#
+# ROUTING LOGIC:
+# - Keywords match as substrings of the lowercased message (same as `keyword in text`)
+# - All matching skills are found in one scan, O(message length + matches)
+# - Highest priority wins; ties go to the skill registered first
+# - Default: Falls back to the default skill when nothing matches
+#
+# USAGE:
+#   router = SkillRouter(default="greeting")
+#   router.register("quote", ["quote", "inspire"], priority=1)
+#   router.register("greeting", ["hello", "hi"])
+#   router.route("inspire me")  # -> "quote"
+# ================================================================
+from collections import deque
+
+
+class SkillRouter:
+    """Routes messages to skills using a single compiled keyword automaton"""
+
+    def __init__(self, default: str = None):
+        self.default = default
+        self._skills = []       # skill ids, in registration order (bit i == skills[i])
+        self._keywords = {}     # skill id -> keywords
+        self._priority = {}     # skill id -> priority
+        self._compiled = False
+
+    def register(self, skill_id: str, keywords, priority: int = 0):
+        """Register (or replace) a skill's keywords. Higher priority wins when several match."""
+        if skill_id not in self._keywords:
+            self._skills.append(skill_id)
+        self._keywords[skill_id] = [k.lower() for k in keywords if k]
+        self._priority[skill_id] = priority
+        self._compiled = False
+
+    @property
+    def skills(self):
+        return list(self._skills)
+
+    def compile(self):
+        """Build the Aho-Corasick automaton over every registered keyword."""
+        goto = [{}]   # state -> {char: next state}
+        output = [0]  # state -> bitmask of skills whose keyword ends here
+
+        for bit, skill_id in enumerate(self._skills):
+            for keyword in self._keywords[skill_id]:
+                state = 0
+                for char in keyword:
+                    next_state = goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(goto)
+                        goto[state][char] = next_state
+                        goto.append({})
+                        output.append(0)
+                    state = next_state
+                output[state] |= 1 << bit
+
+        # Breadth-first pass: failure links point at the longest proper suffix
+        # that is also a prefix of some keyword; outputs are inherited along them.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                output[next_state] |= output[fail[next_state]]
+
+        # Skill bits ordered by (priority desc, registration order) for resolution
+        self._order = sorted(
+            range(len(self._skills)),
+            key=lambda bit: (-self._priority[self._skills[bit]], bit),
+        )
+        self._goto, self._fail, self._output = goto, fail, output
+        self._compiled = True
+        return self
+
+    def _scan(self, text: str) -> int:
+        if not self._compiled:
+            self.compile()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        found = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found |= output[state]
+        return found
+
+    def match(self, text: str):
+        """Return every matching skill id, best first."""
+        found = self._scan(text.lower())
+        return [self._skills[bit] for bit in self._order if found >> bit & 1]
+
+    def route(self, text: str):
+        """Return the best matching skill id, or the default skill."""
+        found = self._scan(text.lower())
+        for bit in self._order:
+            if found >> bit & 1:
+                return self._skills[bit]
+        return self.default
@@ -0,0 +1,195 @@
+# ================================================================
+# sqlite_task_store.py - Persistent, Bounded Task Store
+# ================================================================
+# PURPOSE: Drop-in replacement for InMemoryTaskStore that survives restarts
+#          and keeps memory flat on long-running servers
+#
+# COMPONENTS:
+# - SQLiteTaskStore: a2a TaskStore backed by a SQLite file
+#
+# FUNCTIONALITY:
+# - WAL journal mode, so reads never block behind writes
+# - Batched writes: saves are buffered and flushed in one transaction
+#   every `flush_interval` seconds or every `batch_size` tasks
+# - LRU front cache of the `cache_size` most recently used tasks
+#   (cache_size=0 turns it off, for files shared by several processes)
+# - TTL eviction: tasks not updated for `ttl_seconds` are deleted
+# - Failed background flushes are logged and the batch is retried every
+#   RETRY_INTERVAL seconds, so no save is dropped silently
+# - close(): flushes pending writes (called from the app's lifespan)
+#
+# USAGE:
+#   task_store = SQLiteTaskStore("tasks.db", ttl_seconds=24 * 3600)
+#   DefaultRequestHandler(agent_executor=..., task_store=task_store)
+# ================================================================
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from a2a.server.tasks import TaskStore
+from a2a.types import Task
+from tracing import LOGGER_NAME
+
+RETRY_INTERVAL = 1.0  # seconds before retrying a failed background flush
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+class SQLiteTaskStore(TaskStore):
+    """SQLite-backed TaskStore with an LRU cache, batched writes and TTL eviction"""
+
+    def __init__(
+        self,
+        db_path: str = "tasks.db",
+        ttl_seconds: float = 24 * 3600,
+        cache_size: int = 1024,
+        batch_size: int = 100,
+        flush_interval: float = 0.05,
+        evict_interval: float = 60.0,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.evict_interval = evict_interval
+
+        self._cache = OrderedDict()  # task id -> (Task, updated_at), most recent last
+        self._pending = {}           # task id -> (json or None for delete, updated_at)
+        self._flushing = {}          # batch currently being written
+        self._flush_task = None
+        self._flush_lock = asyncio.Lock()
+        self._last_evict = 0.0
+
+        # One connection shared by worker threads; the lock serializes access
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " id TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_updated_at ON tasks (updated_at)")
+
+    # ---------------- TaskStore interface ----------------
+
+    async def save(self, task: Task, context=None):
+        now = time.time()
+        self._remember(task.id, task, now)
+        self._pending[task.id] = (task.model_dump_json(), now)
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def get(self, task_id: str, context=None) -> Task | None:
+        now = time.time()
+        cached = self._cache.get(task_id)
+        if cached is not None:
+            task, updated_at = cached
+            if now - updated_at <= self.ttl_seconds:
+                self._cache.move_to_end(task_id)
+                return task
+            del self._cache[task_id]
+            return None
+
+        # Written recently but already pushed out of the cache, or deleted
+        for batch in (self._pending, self._flushing):
+            if task_id in batch:
+                data, _ = batch[task_id]
+                return None if data is None else Task.model_validate_json(data)
+
+        row = await asyncio.to_thread(self._select, task_id, now - self.ttl_seconds)
+        if row is None:
+            return None
+        task = Task.model_validate_json(row[0])
+        self._remember(task_id, task, row[1])
+        return task
+
+    async def delete(self, task_id: str, context=None):
+        self._cache.pop(task_id, None)
+        self._pending[task_id] = (None, time.time())
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    # ---------------- Persistence ----------------
+
+    async def flush(self):
+        """Write every pending save/delete in one transaction and evict expired tasks."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            self._flushing = batch
+            now = time.time()
+            evict_before = None
+            if now - self._last_evict >= self.evict_interval:
+                evict_before = now - self.ttl_seconds
+                self._last_evict = now
+            try:
+                await asyncio.to_thread(self._write, batch, evict_before)
+            except Exception:
+                # Keep the batch for the next flush unless newer writes replaced it
+                for task_id, entry in batch.items():
+                    self._pending.setdefault(task_id, entry)
+                raise
+            finally:
+                self._flushing = {}
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+    async def _flush_later(self, delay: float = None):
+        try:
+            await asyncio.sleep(self.flush_interval if delay is None else delay)
+            self._flush_task = None
+            await self.flush()
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # flush() put the batch back into _pending; try again later
+            logger.exception("Task store flush failed", extra={"pending": len(self._pending)})
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_later(RETRY_INTERVAL))
+
+    def _remember(self, task_id: str, task: Task, updated_at: float):
+        self._cache[task_id] = (task, updated_at)
+        self._cache.move_to_end(task_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _select(self, task_id: str, not_before: float):
+        with self._db_lock:
+            return self._conn.execute(
+                "SELECT data, updated_at FROM tasks WHERE id = ? AND updated_at >= ?",
+                (task_id, not_before),
+            ).fetchone()
+
+    def _write(self, batch: dict, evict_before: float = None):
+        upserts = [(task_id, data, ts) for task_id, (data, ts) in batch.items() if data is not None]
+        deletes = [(task_id,) for task_id, (data, _) in batch.items() if data is None]
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO tasks (id, data, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                    upserts,
+                )
+                self._conn.executemany("DELETE FROM tasks WHERE id = ?", deletes)
+                if evict_before is not None:
+                    self._conn.execute("DELETE FROM tasks WHERE updated_at < ?", (evict_before,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
@@ -5,21 +5,30 @@
 #
 # FEATURES:
 # - Fetches agent card from server
-# - Interactive menu with 5 options:
+# - Interactive menu with 6 options:
 #   1. Test greeting skill with custom/default messages
 #   2. Test quote skill with custom/default messages
 #   3. Send completely custom messages
 #   4. Run all predefined tests automatically
-#   5. Exit application
+#   5. Stream a message and measure time-to-first-byte
+#   6. Exit application
+# - Benchmark mode (--benchmark): fires concurrent requests with a mix of
+#   greeting/quote/default messages over one pooled httpx.AsyncClient and
+#   reports throughput, latency percentiles, error rate and routing accuracy
 #
 # FUNCTIONALITY:
 # - Connects to A2A server on localhost:9999
 # - Sends messages and displays formatted responses
-# - Extracts response text from A2A message format
+# - Extracts response text from A2A message/task format
+# - Streams responses chunk by chunk, timing the first chunk
 # - Provides continuous testing loop with user choices
 #
 # USAGE: uv run --active test_client.py (after starting server)
+#        uv run --active test_client.py --benchmark --requests 500 --concurrency 20 [--streaming]
 # ================================================================
+import argparse
+import asyncio
+import time
 import uuid
 import httpx
 from a2a.client import A2ACardResolver, A2AClient
@@ -30,27 +39,56 @@ from a2a.types import (
     Part,
     Role,
     SendMessageRequest,
+    SendStreamingMessageRequest,
     TextPart,
 )
 
 PUBLIC_AGENT_CARD_PATH = "/.well-known/agent.json"
 BASE_URL = "http://localhost:9999"
 
+# (message, skill id the router is expected to pick)
+BENCHMARK_MESSAGES = [
+    ("Hello", "hello_world"),
+    ("Hi there!", "hello_world"),
+    ("Give me a quote", "quote"),
+    ("Inspire me", "quote"),
+    ("Motivate me please", "quote"),
+    ("Random message", "hello_world"),
+]
 
-async def test_message(client: A2AClient, message_text: str, description: str):
-    print(f"\n--- {description} ---")
-    print(f"Sending: '{message_text}'")
-    
+
+def build_params(message_text: str) -> MessageSendParams:
     message_payload = Message(
         role=Role.user,
         messageId=str(uuid.uuid4()),
         parts=[Part(root=TextPart(text=message_text))],
     )
+    return MessageSendParams(message=message_payload)
+
+
+def extract_text(result: dict) -> str | None:
+    """Pull the text out of a Message, a Task (artifacts) or a status update event"""
+    candidates = [result]
+    candidates += result.get('artifacts') or []
+    if result.get('artifact'):
+        candidates.append(result['artifact'])
+    if result.get('status') and result['status'].get('message'):
+        candidates.append(result['status']['message'])
+
+    for candidate in candidates:
+        for part in candidate.get('parts') or []:
+            if part.get('text'):
+                return part['text']
+    return None
+
+
+async def test_message(client: A2AClient, message_text: str, description: str):
+    print(f"\n--- {description} ---")
+    print(f"Sending: '{message_text}'")
+    
     request = SendMessageRequest(
         id=str(uuid.uuid4()),
-        params=MessageSendParams(
-            message=message_payload,
-        ),
+        params=build_params(message_text),
     )
 
     response = await client.send_message(request)
@@ -63,12 +101,7 @@ async def test_message(client: A2AClient, message_text: str, description: str):
         response_dict = response.model_dump()
         
         if 'result' in response_dict and response_dict['result']:
-            result = response_dict['result']
-            if 'parts' in result and result['parts']:
-                for part in result['parts']:
-                    if 'text' in part and part['text']:
-                        response_text = part['text']
-                        break
+            response_text = extract_text(response_dict['result']) or response_text
                         
     except Exception as e:
         print(f"Error extracting response text: {e}")
@@ -77,29 +110,149 @@ async def test_message(client: A2AClient, message_text: str, description: str):
     return response
 
 
+async def test_streaming_message(client: A2AClient, message_text: str, description: str):
+    print(f"\n--- {description} ---")
+    print(f"Streaming: '{message_text}'")
+
+    request = SendStreamingMessageRequest(
+        id=str(uuid.uuid4()),
+        params=build_params(message_text),
+    )
+
+    start = time.perf_counter()
+    first_byte = None
+    chunks = 0
+
+    async for event in client.send_message_streaming(request):
+        result = event.model_dump().get('result') or {}
+        # Artifact events repeat the streamed text; only print the working chunks
+        if result.get('kind') == 'artifact-update':
+            continue
+        text = extract_text(result)
+        if text:
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            chunks += 1
+            print(f"  📨 {text}")
+
+    total = time.perf_counter() - start
+    ttfb = f"{first_byte * 1000:.1f} ms" if first_byte is not None else "n/a"
+    print(f"✅ {chunks} chunks | time to first byte: {ttfb} | total: {total * 1000:.1f} ms")
+
+
+def responding_skill(result: dict) -> str | None:
+    """Skill id of a completed task (the executor names the artifact after the skill)"""
+    artifacts = result.get('artifacts') or []
+    if result.get('artifact'):
+        artifacts = [result['artifact']]
+    return artifacts[0].get('name') if artifacts else None
+
+
+async def timed_request(client: A2AClient, message_text: str, streaming: bool):
+    """Send one message; returns (latency seconds, responding skill id)"""
+    start = time.perf_counter()
+    skill = None
+    if streaming:
+        request = SendStreamingMessageRequest(id=str(uuid.uuid4()), params=build_params(message_text))
+        async for event in client.send_message_streaming(request):
+            payload = event.model_dump()
+            if payload.get('error'):
+                raise RuntimeError(payload['error'])
+            skill = responding_skill(payload.get('result') or {}) or skill
+    else:
+        request = SendMessageRequest(id=str(uuid.uuid4()), params=build_params(message_text))
+        response = (await client.send_message(request)).model_dump()
+        if response.get('error'):
+            raise RuntimeError(response['error'])
+        skill = responding_skill(response.get('result') or {})
+    return time.perf_counter() - start, skill
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def benchmark(client: A2AClient, total_requests: int, concurrency: int, streaming: bool) -> None:
+    print(f"\n🚀 Benchmark: {total_requests} requests, concurrency {concurrency}, "
+          f"{'streaming' if streaming else 'send_message'}")
+
+    latencies = []
+    errors = []
+    misrouted = []
+    next_request = 0
+
+    async def worker():
+        nonlocal next_request
+        while next_request < total_requests:
+            message_text, expected = BENCHMARK_MESSAGES[next_request % len(BENCHMARK_MESSAGES)]
+            next_request += 1
+            try:
+                latency, skill = await timed_request(client, message_text, streaming)
+            except Exception as e:
+                errors.append(repr(e))
+                continue
+            latencies.append(latency)
+            if skill != expected:
+                misrouted.append((message_text, expected, skill))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print("-" * 50)
+    print(f"Completed:   {len(latencies)}/{total_requests} in {elapsed:.2f} s")
+    print(f"Throughput:  {len(latencies) / elapsed:.1f} req/s")
+    print(f"Error rate:  {len(errors) / total_requests:.2%}")
+    if latencies:
+        print(f"Latency ms:  p50 {percentile(latencies, 50) * 1000:.1f} | "
+              f"p90 {percentile(latencies, 90) * 1000:.1f} | "
+              f"p99 {percentile(latencies, 99) * 1000:.1f} | "
+              f"max {latencies[-1] * 1000:.1f}")
+        print(f"Routing:     {len(latencies) - len(misrouted)}/{len(latencies)} routed to the expected skill")
+    for message_text, expected, skill in misrouted[:5]:
+        print(f"  ❌ '{message_text}': expected {expected}, got {skill}")
+    for error in errors[:5]:
+        print(f"  ❌ {error}")
+
+
+async def connect(httpx_client: httpx.AsyncClient) -> A2AClient:
+    # Initialize A2ACardResolver
+    resolver = A2ACardResolver(
+        httpx_client=httpx_client,
+        base_url=BASE_URL,
+    )
+
+    try:
+        print(f"Fetching agent card from: {BASE_URL}{PUBLIC_AGENT_CARD_PATH}")
+        agent_card = await resolver.get_agent_card()
+        print("✅ Fetched agent card successfully")
+        print(f"Agent: {agent_card.name}")
+        print(f"Skills: {[skill.name for skill in agent_card.skills]}")
+
+    except Exception as e:
+        print(f"❌ Error fetching agent card: {e}")
+        raise RuntimeError("Failed to fetch agent card")
+
+    client = A2AClient(
+        httpx_client=httpx_client, agent_card=agent_card
+    )
+    print("✅ A2AClient initialized")
+    return client
+
+
+async def run_benchmark(total_requests: int, concurrency: int, streaming: bool) -> None:
+    # One pooled client shared by every request, sized to the concurrency
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as httpx_client:
+        client = await connect(httpx_client)
+        await benchmark(client, total_requests, concurrency, streaming)
+
+
 async def main() -> None:
     async with httpx.AsyncClient() as httpx_client:
-        # Initialize A2ACardResolver
-        resolver = A2ACardResolver(
-            httpx_client=httpx_client,
-            base_url=BASE_URL,
-        )
-
-        try:
-            print(f"Fetching agent card from: {BASE_URL}{PUBLIC_AGENT_CARD_PATH}")
-            agent_card = await resolver.get_agent_card()
-            print("✅ Fetched agent card successfully")
-            print(f"Agent: {agent_card.name}")
-            print(f"Skills: {[skill.name for skill in agent_card.skills]}")
-
-        except Exception as e:
-            print(f"❌ Error fetching agent card: {e}")
-            raise RuntimeError("Failed to fetch agent card")
-
-        client = A2AClient(
-            httpx_client=httpx_client, agent_card=agent_card
-        )
-        print("✅ A2AClient initialized")
+        client = await connect(httpx_client)
 
         # Interactive menu
         while True:
@@ -111,10 +264,11 @@ async def main() -> None:
             print("2. 💪 Quote/Motivation (quote, inspire, motivate)")
             print("3. 🎲 Custom message")
             print("4. 🚀 Run all tests")
-            print("5. ❌ Exit")
+            print("5. ⚡ Streaming (time-to-first-byte)")
+            print("6. ❌ Exit")
             print("-"*50)
             
-            choice = input("Enter your choice (1-5): ").strip()
+            choice = input("Enter your choice (1-6): ").strip()
             
             if choice == "1":
                 print("\n🖐️ Testing Greeting Skill...")
@@ -149,14 +303,21 @@ async def main() -> None:
                 print("\n✅ All tests completed!")
                 
             elif choice == "5":
+                print("\n⚡ Testing Streaming...")
+                message = input("Enter message (or press Enter for 'Inspire me'): ").strip()
+                if not message:
+                    message = "Inspire me"
+                await test_streaming_message(client, message, "Streaming Test")
+
+            elif choice == "6":
                 print("\n👋 Goodbye!")
                 break
                 
             else:
-                print("❌ Invalid choice! Please enter 1-5.")
+                print("❌ Invalid choice! Please enter 1-6.")
                 
             # Ask if user wants to continue
-            if choice in ["1", "2", "3"]:
+            if choice in ["1", "2", "3", "5"]:
                 continue_choice = input("\nWould you like to test something else? (y/n): ").strip().lower()
                 if continue_choice not in ['y', 'yes']:
                     print("\n👋 Goodbye!")
@@ -164,5 +325,14 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Multi-skill agent test client")
+    parser.add_argument("--benchmark", action="store_true", help="run the non-interactive load test")
+    parser.add_argument("--requests", type=int, default=200, help="total requests to send")
+    parser.add_argument("--concurrency", type=int, default=10, help="requests in flight at once")
+    parser.add_argument("--streaming", action="store_true", help="use message/stream instead of message/send")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        asyncio.run(run_benchmark(args.requests, args.concurrency, args.streaming))
+    else:
+        asyncio.run(main())
\ No newline at end of file
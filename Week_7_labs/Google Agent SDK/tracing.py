@@ -0,0 +1,175 @@
+# ================================================================
+# tracing.py - Structured Logging and Per-Request Tracing
+# ================================================================
+# PURPOSE: Lets the executor log and time requests without doing
+#          synchronous I/O on the event loop
+#
+# COMPONENTS:
+# - setup_logging(): JSON log records pushed through a QueueHandler;
+#   a QueueListener thread does the actual writing
+# - Tracer / Trace: per-request spans (parse, route, invoke) with timing,
+#   exported as OTLP-style JSON lines to a local file
+#
+# CONFIGURATION (environment variables):
+# - A2A_LOG_LEVEL: DEBUG, INFO (default), WARNING, ...
+# - A2A_TRACE_FILE: path of the span export file; tracing is off when unset
+#
+# COST WHEN DISABLED: log calls below the level return immediately and
+# spans are bare no-op context managers
+# ================================================================
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import secrets
+import time
+from contextlib import contextmanager, nullcontext
+
+LOGGER_NAME = "a2a_agent"
+TRACE_LOGGER_NAME = "a2a_agent.traces"
+
+# Fields every LogRecord has; anything else came in through `extra=`
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including any `extra=` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update({k: v for k, v in vars(record).items() if k not in _RECORD_FIELDS})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def setup_logging(level: str = None, trace_file: str = None) -> logging.handlers.QueueListener:
+    """Route agent logs (and spans, if trace_file is set) through a background writer thread.
+
+    Returns the started QueueListener; call .stop() on shutdown to drain it.
+    """
+    level = level or os.getenv("A2A_LOG_LEVEL", "INFO")
+    trace_file = trace_file if trace_file is not None else os.getenv("A2A_TRACE_FILE")
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+
+    console = logging.StreamHandler()
+    console.setFormatter(JsonFormatter())
+    # Span records go to the export file only
+    console.addFilter(lambda record: not record.name.startswith(TRACE_LOGGER_NAME))
+    handlers = [console]
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level.upper())
+    logger.handlers[:] = [queue_handler]
+    logger.propagate = False
+
+    trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+    trace_logger.disabled = not trace_file
+    if trace_file:
+        exporter = logging.FileHandler(trace_file)
+        exporter.setFormatter(logging.Formatter("%(message)s"))
+        exporter.addFilter(lambda record: record.name.startswith(TRACE_LOGGER_NAME))
+        handlers.append(exporter)
+        trace_logger.setLevel(logging.INFO)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Trace:
+    """Spans for one request; exported as a single JSON line when finished"""
+
+    def __init__(self, name: str, exporter: logging.Logger, **attributes):
+        self.trace_id = secrets.token_hex(16)
+        self.root_id = secrets.token_hex(8)
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.spans = []
+        self._exporter = exporter
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        start_ns = time.time_ns()
+        start = time.perf_counter_ns()
+        try:
+            yield attributes  # callers may add attributes while the span is open
+        finally:
+            self.spans.append(self._span(name, self.root_id, start_ns, start_ns + time.perf_counter_ns() - start, attributes))
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def finish(self):
+        spans = [self._span(self.name, "", self.start_ns, time.time_ns(), self.attributes, self.root_id)]
+        spans += self.spans
+        self._exporter.info(json.dumps({
+            "resourceSpans": [{
+                "resource": {"attributes": [_attribute("service.name", LOGGER_NAME)]},
+                "scopeSpans": [{"scope": {"name": TRACE_LOGGER_NAME}, "spans": spans}],
+            }]
+        }))
+
+    def _span(self, name, parent_id, start_ns, end_ns, attributes, span_id=None) -> dict:
+        return {
+            "traceId": self.trace_id,
+            "spanId": span_id or secrets.token_hex(8),
+            "parentSpanId": parent_id,
+            "name": name,
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": [_attribute(k, v) for k, v in attributes.items()],
+        }
+
+
+class _NullTrace:
+    """Stand-in used when tracing is disabled: every call is a no-op"""
+
+    def span(self, name: str, **attributes):
+        # A new dict each time: callers write attributes into it
+        return nullcontext({})
+
+    def set(self, **attributes):
+        pass
+
+    def finish(self):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class Tracer:
+    def __init__(self):
+        self._exporter = logging.getLogger(TRACE_LOGGER_NAME)
+
+    @property
+    def enabled(self) -> bool:
+        return not self._exporter.disabled and self._exporter.isEnabledFor(logging.INFO)
+
+    def start_trace(self, name: str, **attributes):
+        if not self.enabled:
+            return NULL_TRACE
+        return Trace(name, self._exporter, **attributes)
+
+
+tracer = Tracer()
@@ -16,11 +16,147 @@
 # What This Server Does – A Calculator App
 # In this example, the MCP server acts as a simple calculator backend, providing arithmetic functions through tools, dynamic greetings via resources, and an intelligent prompt to guide the user.
 
+import asyncio
+import math
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from decimal import MAX_EMAX, MIN_EMIN, Context, Decimal, DecimalException
+from typing import Optional, Union
+
 from mcp.server.fastmcp import FastMCP
 
 # Initialize the Server
 mcp = FastMCP("calculator server")
 
+# Numeric Execution Engine
+# Integer results can grow without bound: power(10, 10**7) has ten million digits, and computing
+# it inline would block the single stdio loop for every other request. Each multiply/power call is
+# sized before it runs:
+#   - small results are computed inline,
+#   - large exact results are computed in a worker process with a timeout,
+#   - anything past MAX_EXACT_DIGITS is rejected (mode="decimal" returns a rounded result instead).
+# Results are always returned as strings, so small and large results have the same type.
+INLINE_MAX_DIGITS = 4_000       # below Python's default int -> str conversion limit
+MAX_EXACT_DIGITS = 200_000      # largest exact result we are willing to build and serialize
+WORKER_TIMEOUT = 5.0            # seconds to wait for a worker before giving up
+POOL_WORKERS = 2
+DEFAULT_PRECISION = 28          # significant digits in decimal mode (same as decimal's default)
+MAX_PRECISION = 1_000
+
+Number = Union[int, float]
+
+_pool = None
+
+
+def estimate_digits(operation: str, a: Number, b: Number) -> float:
+    """Estimate the number of decimal digits in the exact result, without computing it."""
+    # Only int op int can grow without bound; floats overflow (or go to inf) instead.
+    if not (isinstance(a, int) and isinstance(b, int)):
+        return 0
+    if operation == "multiply":
+        return math.log10(abs(a) or 1) + math.log10(abs(b) or 1) + 1
+    if operation == "power":
+        if b <= 0 or abs(a) <= 1:
+            return 1
+        return b * math.log10(abs(a)) + 1
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+def _exact(operation: str, a: Number, b: Number) -> Number:
+    if operation == "multiply":
+        return a * b
+    if a < 0 and b != int(b):
+        # Python would return a complex number here
+        raise ValueError("A negative number cannot be raised to a fractional power")
+    try:
+        return a ** b
+    except ZeroDivisionError as e:
+        # 0 ** -1 (int or float)
+        raise ValueError("Zero cannot be raised to a negative power") from e
+    except OverflowError as e:
+        # float ** float past ~1.8e308; ints never overflow, they are sized by estimate_digits
+        raise ValueError(f"Result is too large for a float: {e}. Use mode='decimal' instead.") from e
+
+
+def _exact_to_str(operation: str, a: int, b: int) -> str:
+    # Runs in a worker process; converting a huge int to str is as costly as computing it.
+    return str(_exact(operation, a, b))
+
+
+def _init_worker():
+    if hasattr(sys, "set_int_max_str_digits"):
+        sys.set_int_max_str_digits(0)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # "spawn" avoids forking the server while its stdio threads hold locks.
+        _pool = ProcessPoolExecutor(
+            max_workers=POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+    return _pool
+
+
+def _reset_pool():
+    # A timed-out job keeps its worker busy, and shutdown() alone would let it run to the end;
+    # kill the workers and start a fresh pool so later requests don't queue behind it.
+    global _pool
+    if _pool is not None:
+        for process in list((_pool._processes or {}).values()):
+            process.terminate()
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _decimal(operation: str, a: Number, b: Number, precision: int) -> str:
+    context = Context(prec=precision, Emax=MAX_EMAX, Emin=MIN_EMIN)
+    # str() keeps floats at their shortest repr instead of their full binary expansion.
+    x, y = Decimal(str(a)), Decimal(str(b))
+    try:
+        result = context.multiply(x, y) if operation == "multiply" else context.power(x, y)
+    except DecimalException as e:
+        raise ValueError(f"Invalid {operation} in decimal mode: {e!r}") from e
+    if result.is_infinite():
+        # decimal returns Infinity for 0 ** -n instead of signalling DivisionByZero
+        raise ValueError("Zero cannot be raised to a negative power")
+    return str(result)
+
+
+async def compute(operation: str, a: Number, b: Number, mode: str = "exact", precision: Optional[int] = None) -> str:
+    """Compute a multiply/power result without letting one request stall the server.
+
+    mode="exact" returns the exact value as a string (digits for integers, repr for floats);
+    mode="decimal" returns a decimal string rounded to `precision` significant digits.
+    """
+    if mode == "decimal":
+        precision = precision or DEFAULT_PRECISION
+        if not 1 <= precision <= MAX_PRECISION:
+            raise ValueError(f"precision must be between 1 and {MAX_PRECISION}")
+        return _decimal(operation, a, b, precision)
+    if mode != "exact":
+        raise ValueError("mode must be 'exact' or 'decimal'")
+
+    digits = estimate_digits(operation, a, b)
+    if digits <= INLINE_MAX_DIGITS:
+        return str(_exact(operation, a, b))
+    if digits > MAX_EXACT_DIGITS:
+        raise ValueError(
+            f"Result would have about {digits:,.0f} digits (limit {MAX_EXACT_DIGITS:,}). "
+            "Use mode='decimal' for a rounded result."
+        )
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_get_pool(), _exact_to_str, operation, a, b)
+    try:
+        return await asyncio.wait_for(future, WORKER_TIMEOUT)
+    except asyncio.TimeoutError as e:
+        _reset_pool()
+        raise TimeoutError(f"{operation} did not finish within {WORKER_TIMEOUT} seconds") from e
+
 # Register Tools (Functional APIs)
 # Each function is decorated with @mcp.tool("Name"), making it callable through the MCP protocol.
 @mcp.tool("Addition")
@@ -35,9 +171,15 @@ def subtract(a: int, b: int) -> int:
     return a-b
 
 @mcp.tool("multiply")
-def multiply(a: int, b: int) -> int:
-    """Multiply two numbers."""
-    return a*b
+async def multiply(a: Number, b: Number, mode: str = "exact", precision: Optional[int] = None) -> str:
+    """Multiply two numbers. Use mode="decimal" with an optional precision for a rounded result."""
+    return await compute("multiply", a, b, mode, precision)
+
+@mcp.tool("power")
+async def power(a: Number, b: Number, mode: str = "exact", precision: Optional[int] = None) -> str:
+    """Raise the first number to the power of the second. Very large exact results are refused;
+    use mode="decimal" with an optional precision to get a rounded result instead."""
+    return await compute("power", a, b, mode, precision)
 
 @mcp.tool("division")
 def divide(a: float, b: float) -> float:
@@ -62,21 +204,26 @@ def get_usage() -> str:
 # Add Prompt Logic (Interactive Responses)
 # Prompts allow conversational querying, like natural language requests:    
 @mcp.prompt()
-def calculator_prompt(a: float, b: float, operation: str) -> str:
+async def calculator_prompt(a: float, b: float, operation: str) -> str:
     """Prompt for a calculation and return the result."""
     if operation == "add":
         return f"The result of adding {a} and {b} is {add(a, b)}"
     elif operation == "subtract":
         return f"The result of subtracting {b} from {a} is {subtract(a, b)}"
     elif operation == "multiply":
-        return f"The result of multiplying {a} and {b} is {multiply(a, b)}"
+        return f"The result of multiplying {a} and {b} is {await multiply(a, b)}"
+    elif operation == "power":
+        try:
+            return f"The result of raising {a} to the power of {b} is {await power(a, b)}"
+        except (ValueError, OverflowError, TimeoutError) as e:
+            return str(e)
     elif operation == "divide":
         try:
             return f"The result of dividing {a} by {b} is {divide(a, b)}"
         except ValueError as e:
             return str(e)
     else:
-        return "Invalid operation. Please choose add, subtract, multiply, or divide."
+        return "Invalid operation. Please choose add, subtract, multiply, power, or divide."
 
 # Run the MCP Server
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("mcp")
+
+import calculator  # noqa: E402
+from calculator import MAX_PRECISION  # noqa: E402
+
+
+def power(a, b, **kwargs):
+    return asyncio.run(calculator.power(a, b, **kwargs))
+
+
+def multiply(a, b, **kwargs):
+    return asyncio.run(calculator.multiply(a, b, **kwargs))
+
+
+@pytest.fixture(autouse=True)
+def stop_pool():
+    yield
+    calculator._reset_pool()
+
+
+def test_small_results_are_exact_strings():
+    assert multiply(6, 7) == "42"
+    assert power(2, 10) == "1024"
+    assert power(2.0, 0.5) == repr(2.0 ** 0.5)
+
+
+@pytest.mark.parametrize("a, b", [(0, -1), (0.0, -1), (0, -2.5)])
+def test_zero_to_negative_power_is_a_value_error(a, b):
+    with pytest.raises(ValueError, match="negative power"):
+        power(a, b)
+
+
+def test_float_overflow_is_a_value_error():
+    with pytest.raises(ValueError, match="too large"):
+        power(2.0, 10000.0)
+
+
+def test_negative_base_fractional_exponent():
+    with pytest.raises(ValueError, match="fractional power"):
+        power(-8, 1 / 3)
+
+
+def test_large_exact_result_runs_in_worker():
+    result = power(10, 5000)
+    assert result == "1" + "0" * 5000
+
+
+def test_huge_exact_result_is_refused():
+    with pytest.raises(ValueError, match="mode='decimal'"):
+        power(10, 10**7)
+
+
+def test_decimal_mode_rounds():
+    assert power(10, 10**7, mode="decimal", precision=1) == "1E+10000000"
+    assert multiply(1.1, 3, mode="decimal", precision=5) == "3.3"
+
+
+def test_decimal_mode_errors_are_value_errors():
+    with pytest.raises(ValueError, match="negative power"):
+        power(0, -1, mode="decimal")
+    with pytest.raises(ValueError, match="decimal mode"):
+        power(10, 10**30, mode="decimal")
+    with pytest.raises(ValueError, match="precision"):
+        power(2, 2, mode="decimal", precision=MAX_PRECISION + 1)
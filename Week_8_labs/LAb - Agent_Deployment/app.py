@@ -1,30 +1,80 @@
 # app.py
 
 import streamlit as st
-from main import graph  # 👈 Make sure main.py exposes `graph`
+from main import get_llm, graph, stream_query  # 👈 Make sure main.py exposes these
+from instrumentation import timeline_rows
 import os
 
+MAX_SESSION_RESULTS = 50  # answers remembered per browser session
+
 
 st.set_page_config(page_title="LangGraph Agent", layout="centered")
 
+
+@st.cache_resource(show_spinner="Loading agent...")
+def load_agent():
+    """Compiled graph + LLM client, built once per server process and shared by all sessions"""
+    get_llm()  # Gemini client and response cache
+    return graph
+
+
+def run_agent(agent, query: str) -> dict:
+    """Stream the agent's progress into the page; returns what render_result needs"""
+    live = st.empty()
+    with live.container():
+        status = st.status("Running agent...", expanded=True)
+        st.subheader("✅ Final Answer")
+        answer_box = st.empty()
+
+        partial = ""
+        result = {"query": query, "retry_count": 0}
+        for event in stream_query(query, agent):
+            if event["type"] == "token":
+                partial += event["text"]
+                answer_box.markdown(partial + "▌")
+                continue
+
+            result = {**result, **event["state"]}
+            status.write(f"`{event['node']}` finished in {event['seconds']:.2f}s")
+            if result.get("verification") == "retry":
+                partial = ""  # the answer is being regenerated
+    live.empty()
+    return result
+
+
+def render_result(result: dict, cached: bool):
+    st.success("Done! (from this session's cache)" if cached else "Done!")
+
+    # Final Answer
+    st.subheader("✅ Final Answer")
+    st.markdown(f"**{result.get('final_answer', 'No final answer found.')}**")
+
+    # Intermediate Debug: per-node timeline; the full state is only serialized once asked for
+    with st.expander("🪵 View Full State (Debug Info)"):
+        st.markdown("**⏱️ Per-node timeline** (time, LLM tokens, cache hits, retries)")
+        st.dataframe(timeline_rows(result.get("metrics", [])), hide_index=True, use_container_width=True)
+        if st.toggle("Load full state", key="show_debug"):
+            st.json(result)
+
+
+agent = load_agent()
+results = st.session_state.setdefault("results", {})  # query -> run_agent() output
+
 st.title("🧠 LangGraph AI Agent")
 st.markdown("This agent will decide whether to use a calculator or an LLM based on your query.")
 
 # Input field
-query = st.text_input("Ask me anything:", placeholder="e.g., What is 15 * 7?")
+query = st.text_input("Ask me anything:", placeholder="e.g., What is 15 * 7?").strip()
 
 if st.button("Run Agent") and query:
-    st.write("Running agent...")
-    with st.spinner("Processing..."):
-        input_state = {"query": query, "retry_count": 0}
-        result = graph.invoke(input_state)
+    st.session_state["shown_cached"] = query in results
+    if query not in results:
+        results[query] = run_agent(agent, query)
+        while len(results) > MAX_SESSION_RESULTS:
+            results.pop(next(iter(results)))  # oldest first
+    st.session_state["shown_query"] = query
 
-        st.success("Done!")
-
-        # Final Answer
-        st.subheader("✅ Final Answer")
-        st.markdown(f"**{result.get('final_answer', 'No final answer found.')}**")
-
-        # Intermediate Debug
-        with st.expander("🪵 View Full State (Debug Info)"):
-            st.json(result)
+# Keep showing the last answer across reruns (e.g. when the debug toggle is clicked)
+shown = st.session_state.get("shown_query")
+if shown in results:
+    render_result(results[shown], st.session_state["shown_cached"])
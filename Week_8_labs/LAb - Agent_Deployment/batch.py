@@ -0,0 +1,90 @@
+# batch.py
+#
+# Concurrent batch runner for the LangGraph agent, for offline evaluation runs.
+# Queries run through graph.ainvoke (async nodes, async Gemini client) with at
+# most `concurrency` in flight; each query has its own timeout, and results come
+# back in the same order as the input.
+#
+# Usage:
+#   from batch import run_batch
+#   results = run_batch(["What is 7 * 4?", "Who won the Nobel Peace Prize in 2020?"], concurrency=8)
+#
+#   python batch.py queries.txt --concurrency 16 --timeout 60 --output results.jsonl
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from main import graph
+
+
+async def _run_one(query: str, semaphore: asyncio.Semaphore, timeout: float) -> dict:
+    async with semaphore:
+        start = time.perf_counter()
+        result = {"query": query, "final_answer": None, "error": None}
+        try:
+            state = await asyncio.wait_for(graph.ainvoke({"query": query, "retry_count": 0}), timeout)
+            result["final_answer"] = state.get("final_answer")
+            result["tool_decision"] = state.get("tool_decision")
+            result["verification"] = state.get("verification")
+            result["retry_count"] = state.get("retry_count", 0)
+        except asyncio.TimeoutError:
+            result["error"] = f"timeout after {timeout}s"
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["seconds"] = time.perf_counter() - start
+        return result
+
+
+async def arun_batch(queries, concurrency: int = 8, timeout: float = 60.0) -> list:
+    """Run every query through the graph; returns one result dict per query, in input order."""
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(_run_one(q, semaphore, timeout) for q in queries))
+
+
+def run_batch(queries, concurrency: int = 8, timeout: float = 60.0) -> list:
+    return asyncio.run(arun_batch(queries, concurrency, timeout))
+
+
+def summarize(results: list, elapsed: float) -> dict:
+    latencies = sorted(r["seconds"] for r in results)
+    errors = [r for r in results if r["error"]]
+    return {
+        "queries": len(results),
+        "answered": sum(1 for r in results if r["final_answer"]),
+        "errors": len(errors),
+        "timeouts": sum(1 for r in errors if r["error"].startswith("timeout")),
+        "elapsed_seconds": round(elapsed, 2),
+        "queries_per_second": round(len(results) / elapsed, 2) if elapsed else None,
+        "median_seconds": round(latencies[len(latencies) // 2], 3) if latencies else None,
+        "max_seconds": round(latencies[-1], 3) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many queries through the agent concurrently")
+    parser.add_argument("queries_file", help="text file with one query per line ('-' for stdin)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds allowed per query")
+    parser.add_argument("--output", help="write one JSON result per line to this file")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.queries_file == "-" else open(args.queries_file)
+    with source:
+        queries = [line.strip() for line in source if line.strip()]
+
+    start = time.perf_counter()
+    results = run_batch(queries, args.concurrency, args.timeout)
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, "w") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+    print(json.dumps(summarize(results, elapsed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmark_calculator.py
+#
+# Compares the old calculator path (regex `\d+ op \d+` + eval) with safe_math
+# (expression extraction + AST-whitelisted, cached compiled evaluation) on the
+# same queries, and shows which queries each path can answer at all.
+# Runs offline: only the calculator code is exercised, not the graph or the LLM.
+#
+# Usage: python benchmark_calculator.py [--repeat 20000]
+
+import argparse
+import re
+import time
+
+from safe_math import compile_expression, evaluate, extract_expression
+
+OLD_EXPRESSION = re.compile(r"(\d+\s*[\+\-\*/]\s*\d+)")
+
+QUERIES = [
+    "What is 7 * 4?",
+    "Calculate 1234 + 5678",
+    "What is 100 / 8?",
+    "What is (3 + 4) * 2?",
+    "What is 1.5 * 2?",
+    "What is 2^10?",
+    "What is 12 x 3 - 4?",
+    "What is -5 + 3 * (2 - 7)?",
+    "What is 100 ÷ 8?",
+]
+
+# Inputs the old eval() path would hang on or execute
+HOSTILE = ["9**9**9**9", "(2**100000)**100000", "__import__('os').getcwd()", "(1).__class__"]
+
+
+def old_path(query: str):
+    match = OLD_EXPRESSION.search(query)
+    if not match:
+        return None
+    try:
+        return eval(match.group(1), {"__builtins__": {}}, {})
+    except Exception as e:
+        return f"Error: {e}"
+
+
+def new_path(query: str):
+    expression = extract_expression(query)
+    if not expression:
+        return None
+    try:
+        return evaluate(expression)
+    except Exception as e:
+        return f"Error: {e}"
+
+
+def time_path(func, inputs, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in inputs:
+            func(item)
+    return (time.perf_counter() - start) / (repeat * len(inputs)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calculator tool benchmark: eval vs safe_math")
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'query':32} {'old (eval)':>14} {'new (safe_math)':>16}")
+    for query in QUERIES:
+        print(f"{query:32} {str(old_path(query)):>14} {str(new_path(query)):>16}")
+
+    old_us = time_path(old_path, QUERIES, args.repeat)
+    new_us = time_path(new_path, QUERIES, args.repeat)
+    info = compile_expression.cache_info()
+    print(f"\nfull query, old path: {old_us:.2f} us/query")
+    print(f"full query, new path: {new_us:.2f} us/query (compiled-expression cache: {info.hits} hits, {info.misses} misses)")
+
+    # Evaluation alone, on expressions both paths accept
+    expressions = [e for e in map(extract_expression, QUERIES) if e and "**" not in e]
+    eval_us = time_path(lambda e: eval(e, {"__builtins__": {}}, {}), expressions, args.repeat)
+    compiled_us = time_path(evaluate, expressions, args.repeat)
+    print(f"evaluation only: eval {eval_us:.2f} us, compiled {compiled_us:.2f} us per expression")
+
+    print("\nHostile inputs (new path only; eval would hang or run them):")
+    for expression in HOSTILE:
+        start = time.perf_counter()
+        try:
+            outcome = evaluate(expression)
+        except Exception as e:
+            outcome = f"rejected: {e}"
+        print(f"  {expression:30} {outcome} ({(time.perf_counter() - start) * 1e6:.0f} us)")
+
+
+if __name__ == "__main__":
+    main()
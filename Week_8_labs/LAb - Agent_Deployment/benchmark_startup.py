@@ -0,0 +1,60 @@
+# benchmark_startup.py
+#
+# Measures how long a fresh interpreter takes to import the agent module that
+# app.py loads (`from main import graph`), i.e. the cost Streamlit pays on startup.
+# Each run is a new process so nothing is reused from the module cache.
+# LLM_BACKEND=fake keeps the measurement offline even if something regressed
+# and called the LLM at import time.
+#
+# Usage: python benchmark_startup.py [--runs 5] [--module main] [--top 10]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def time_import(module: str) -> float:
+    env = {**os.environ, "LLM_BACKEND": "fake"}
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=HERE, env=env, check=True)
+    return time.perf_counter() - start
+
+
+def slowest_imports(module: str, top: int):
+    """Parse `python -X importtime` output: (cumulative microseconds, module name), slowest first."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=HERE, env={**os.environ, "LLM_BACKEND": "fake"}, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup-time benchmark for the agent module")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    times = [time_import(args.module) for _ in range(args.runs)]
+    print(f"import {args.module}: median {statistics.median(times) * 1000:.0f} ms, "
+          f"min {min(times) * 1000:.0f} ms over {args.runs} runs (includes interpreter start)")
+
+    print("\nSlowest imports (cumulative):")
+    for cumulative, name in slowest_imports(args.module, args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
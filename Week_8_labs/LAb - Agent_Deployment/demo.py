@@ -0,0 +1,33 @@
+# demo.py
+#
+# Command-line demo: runs the sample queries through the LangGraph agent.
+# Usage: python demo.py ["your question" ...]
+
+import sys
+
+from main import fast_router, get_llm, graph, metrics
+
+# Run the graph with test queries
+DEFAULT_QUERIES = [
+    "What is 7 * 4?",
+    "Who won the Nobel Peace Prize in 2020?"
+]
+
+
+def main(queries):
+    for query in queries:
+        print("\n===============================")
+        input_state = {"query": query, "retry_count": 0}
+        result = graph.invoke(input_state)
+        print(f"User Query: {result['query']}")
+        print(f"Final Answer: {result.get('final_answer', 'No answer')}")
+
+    print(f"\nLLM cache: {get_llm().stats()}")
+    print(f"Routing: {fast_router.report()}")
+    print("Per-node metrics:")
+    for node, summary in metrics.summary().items():
+        print(f"  {node}: {summary}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_QUERIES)
@@ -0,0 +1,72 @@
+# fast_router.py
+#
+# Deterministic pre-classifier that runs before the LLM router in agent_node.
+# Obvious cases are decided locally, so they skip one full LLM round-trip:
+#   - "What is 7 * 4?"               -> calculator (expression + only filler words)
+#   - "Who is the president of France?" -> llm   (no digits, no math vocabulary)
+# Everything else (e.g. "what is seven times four", "population in 2020 * 2")
+# returns None and is left to the LLM router.
+#
+# A local model can be plugged in via `fallback`: any callable query -> "calculator" | "llm" | None,
+# consulted before giving up to the LLM.
+
+import re
+from collections import Counter
+
+from safe_math import find_expression  # same extraction calculator_node uses
+
+# Words that may surround an expression without making the query ambiguous
+FILLER_WORDS = {
+    "what", "whats", "s", "is", "the", "of", "calculate", "compute", "evaluate", "solve",
+    "please", "result", "answer", "value", "how", "much", "tell", "me", "can", "you",
+    "equals", "equal", "to",
+}
+
+# Vocabulary that means a query might be math even without a clean expression
+MATH_WORDS = {
+    "plus", "minus", "times", "multiply", "multiplied", "divide", "divided", "sum",
+    "product", "difference", "quotient", "percent", "percentage", "square", "sqrt",
+    "root", "power", "calculate", "compute", "math", "equation", "average",
+}
+
+
+class FastPathRouter:
+    """Classifies queries as calculator/llm when confident; None means ask the LLM"""
+
+    def __init__(self, fallback=None):
+        self.fallback = fallback
+        self.stats = Counter()
+
+    def classify(self, query: str):
+        decision = self._classify(query)
+        if decision is None and self.fallback is not None:
+            decision = self.fallback(query)
+        self.stats[f"fast_{decision}" if decision else "llm_router"] += 1
+        return decision
+
+    def _classify(self, query: str):
+        text = query.lower()
+        words = re.findall(r"[a-z]+", text)
+
+        found = find_expression(text)
+        if found:
+            start, end, _ = found
+            rest = text[:start] + " " + text[end:]
+            leftover = set(re.findall(r"[a-z]+", rest)) - FILLER_WORDS
+            if not leftover and not re.search(r"\d", rest):
+                return "calculator"
+            return None
+
+        if not re.search(r"\d", text) and not MATH_WORDS.intersection(words):
+            return "llm"
+        return None
+
+    def report(self) -> dict:
+        total = sum(self.stats.values())
+        skipped = total - self.stats["llm_router"]
+        return {
+            **self.stats,
+            "total": total,
+            "llm_calls_skipped": skipped,
+            "skip_rate": skipped / total if total else 0.0,
+        }
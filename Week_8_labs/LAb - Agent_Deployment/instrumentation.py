@@ -0,0 +1,157 @@
+# instrumentation.py
+#
+# Per-node metrics for the LangGraph pipeline.
+#   - instrument(name, node, sink) wraps a node function (sync or async). Each
+#     run records wall time, the LLM calls made inside it (tokens in/out, cache
+#     hits) and the retry_count before/after.
+#   - The record is appended to the state's "metrics" list (so every result
+#     carries its own trace) and sent to a MetricsSink, which aggregates
+#     across queries and can append JSON lines to a file.
+#   - LLM usage reaches the running node through a context variable:
+#     CachedLLM reports every call to record_llm_call() (see main.get_llm()).
+#   - timeline_rows() turns a state's metrics into a flamegraph-style table.
+
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+_usage = ContextVar("node_llm_usage", default=None)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) when the backend reports no usage"""
+    return max(1, len(text) // 4) if text else 0
+
+
+def record_llm_call(prompt: str, content: str, usage=None, cache_hit: bool = False):
+    """CachedLLM listener: add one call to the usage of the node currently running.
+
+    `usage` is (prompt tokens, output tokens) when the backend reports it;
+    cache hits cost no tokens. Outside an instrumented node this is a no-op.
+    """
+    current = _usage.get()
+    if current is None:
+        return
+    if cache_hit:
+        tokens_in, tokens_out = 0, 0
+    else:
+        tokens_in, tokens_out = usage or (estimate_tokens(prompt), estimate_tokens(content))
+    current["llm_calls"] += 1
+    current["cache_hits"] += int(cache_hit)
+    current["tokens_in"] += tokens_in
+    current["tokens_out"] += tokens_out
+
+
+class MetricsSink:
+    """Thread-safe store of node records, with per-node aggregates and optional JSONL output"""
+
+    def __init__(self, path: str = None, max_records: int = 10000):
+        self.path = path
+        self.max_records = max_records
+        self._records = []
+        self._lock = threading.Lock()
+
+    def record(self, entry: dict):
+        with self._lock:
+            self._records.append(entry)
+            del self._records[:-self.max_records]
+            if self.path:
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+
+    def records(self) -> list:
+        with self._lock:
+            return list(self._records)
+
+    def summary(self) -> dict:
+        """node -> calls, total/mean/p95 seconds, tokens, cache hits, retries triggered"""
+        by_node = defaultdict(list)
+        for entry in self.records():
+            by_node[entry["node"]].append(entry)
+        summary = {}
+        for node, entries in by_node.items():
+            seconds = sorted(e["seconds"] for e in entries)
+            summary[node] = {
+                "calls": len(entries),
+                "total_seconds": round(sum(seconds), 4),
+                "mean_seconds": round(sum(seconds) / len(seconds), 4),
+                "p95_seconds": round(seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))], 4),
+                "llm_calls": sum(e["llm_calls"] for e in entries),
+                "tokens_in": sum(e["tokens_in"] for e in entries),
+                "tokens_out": sum(e["tokens_out"] for e in entries),
+                "cache_hits": sum(e["cache_hits"] for e in entries),
+                "retries": sum(1 for e in entries if e["retry_to"] > e["retry_from"]),
+            }
+        return summary
+
+
+def _begin():
+    usage = {"llm_calls": 0, "cache_hits": 0, "tokens_in": 0, "tokens_out": 0}
+    return usage, _usage.set(usage), time.time(), time.perf_counter()
+
+
+def _finish(name, state, result, usage, started, start, sink):
+    entry = {
+        "node": name,
+        "started": started,
+        "seconds": time.perf_counter() - start,
+        **usage,
+        "retry_from": state.get("retry_count", 0),
+        "retry_to": result.get("retry_count", 0),
+    }
+    if sink is not None:
+        sink.record(entry)
+    return {**result, "metrics": list(state.get("metrics", [])) + [entry]}
+
+
+def instrument(name: str, node, sink: MetricsSink = None):
+    """Wrap a graph node so each run is measured; works for plain and async nodes"""
+    if inspect.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def async_wrapper(state):
+            usage, token, started, start = _begin()
+            try:
+                result = await node(state)
+            finally:
+                _usage.reset(token)
+            return _finish(name, state, result, usage, started, start, sink)
+        return async_wrapper
+
+    @functools.wraps(node)
+    def wrapper(state):
+        usage, token, started, start = _begin()
+        try:
+            result = node(state)
+        finally:
+            _usage.reset(token)
+        return _finish(name, state, result, usage, started, start, sink)
+    return wrapper
+
+
+def timeline_rows(metrics: list, width: int = 30) -> list:
+    """One row per node run: offset, duration, share and a bar placed on a common time axis"""
+    if not metrics:
+        return []
+    origin = metrics[0]["started"]
+    total = max(m["started"] - origin + m["seconds"] for m in metrics) or 1e-9
+    rows = []
+    for m in metrics:
+        offset = m["started"] - origin
+        left = min(width - 1, int(offset / total * width))
+        bar = max(1, round(m["seconds"] / total * width))
+        rows.append({
+            "node": m["node"],
+            "start_ms": round(offset * 1000, 1),
+            "ms": round(m["seconds"] * 1000, 1),
+            "share": f"{m['seconds'] / total:.0%}",
+            "timeline": ("░" * left + "█" * bar).ljust(width, "░")[:width],
+            "tokens_in": m["tokens_in"],
+            "tokens_out": m["tokens_out"],
+            "cache_hits": m["cache_hits"],
+            "retry": f"{m['retry_from']} → {m['retry_to']}" if m["retry_to"] != m["retry_from"] else "",
+        })
+    return rows
@@ -0,0 +1,203 @@
+# llm_cache.py
+#
+# Response cache that sits in front of an LLM's invoke(prompt).
+# Identical prompts to the same model (repeated queries, verifier retries)
+# are answered from the cache instead of making another network call.
+#
+# Tiers are checked in order, and a hit in a slower tier is copied into the faster ones:
+#   - MemoryCache: in-process LRU
+#   - SQLiteCache: on-disk, shared across restarts and processes
+# Both expire entries after a TTL. FakeLLM is an offline backend for testing.
+# An optional listener(prompt, content, usage, cache_hit) is told about every call,
+# e.g. for per-node token accounting (instrumentation.record_llm_call).
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class LLMResponse:
+    """Same shape as the GeminiLLM response: a `.content` string"""
+
+    def __init__(self, content: str):
+        self.content = content
+
+
+def cache_key(model_name: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model_name}\0{prompt}".encode()).hexdigest()
+
+
+class MemoryCache:
+    """Thread-safe in-memory LRU cache with per-entry TTL"""
+
+    name = "memory"
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._data[key] = (value, time.time() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+
+class SQLiteCache:
+    """On-disk cache tier with TTL; expired rows are purged on write"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = "llm_cache.db", ttl: float = 24 * 3600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND expires_at >= ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + self.ttl),
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+            self._conn.commit()
+
+
+class CachedLLM:
+    """Wraps an LLM with invoke(prompt) -> .content, caching responses per (model, prompt)"""
+
+    def __init__(self, llm, tiers, listener=None):
+        self.llm = llm
+        self.listener = listener
+        self.model_name = getattr(llm, "model_name", type(llm).__name__)
+        self.tiers = list(tiers)
+        self.hits = {tier.name: 0 for tier in self.tiers}
+        self.misses = 0
+
+    def invoke(self, prompt: str):
+        key = cache_key(self.model_name, prompt)
+        content = self._lookup(key)
+        if content is None:
+            response = self.llm.invoke(prompt)
+            content = response.content
+            self._store(key, content)
+            self._notify(prompt, content, getattr(response, "usage", None))
+        else:
+            self._notify(prompt, content, cache_hit=True)
+        return LLMResponse(content)
+
+    async def ainvoke(self, prompt: str):
+        key = cache_key(self.model_name, prompt)
+        content = self._lookup(key)
+        if content is None:
+            response = await self.llm.ainvoke(prompt)
+            content = response.content
+            self._store(key, content)
+            self._notify(prompt, content, getattr(response, "usage", None))
+        else:
+            self._notify(prompt, content, cache_hit=True)
+        return LLMResponse(content)
+
+    def stream(self, prompt: str):
+        """Yield the response in chunks as the backend produces them; a cached response is one chunk."""
+        key = cache_key(self.model_name, prompt)
+        content = self._lookup(key)
+        if content is not None:
+            self._notify(prompt, content, cache_hit=True)
+            yield content
+            return
+        chunks = []
+        for chunk in self.llm.stream(prompt):
+            chunks.append(chunk)
+            yield chunk
+        content = "".join(chunks)  # only reached if the stream completed
+        self._store(key, content)
+        self._notify(prompt, content)
+
+    def _lookup(self, key: str):
+        for i, tier in enumerate(self.tiers):
+            content = tier.get(key)
+            if content is not None:
+                self.hits[tier.name] += 1
+                for faster in self.tiers[:i]:
+                    faster.set(key, content)
+                return content
+        self.misses += 1
+        return None
+
+    def _store(self, key: str, content: str):
+        if not content.startswith("Error:"):  # never cache failed calls
+            for tier in self.tiers:
+                tier.set(key, content)
+
+    def _notify(self, prompt: str, content: str, usage=None, cache_hit: bool = False):
+        if self.listener is not None:
+            self.listener(prompt, content, usage, cache_hit)
+
+    def stats(self) -> dict:
+        hits = sum(self.hits.values())
+        total = hits + self.misses
+        return {
+            "hits": hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+            "hits_by_tier": dict(self.hits),
+        }
+
+
+class FakeLLM:
+    """Offline stand-in for GeminiLLM: canned answers, no network, records every prompt"""
+
+    model_name = "fake"
+
+    def __init__(self, responses: dict = None, default: str = "This is a fake response."):
+        # responses: substring of the prompt -> answer; first match wins
+        self.responses = responses or {}
+        self.default = default
+        self.prompts = []
+
+    def invoke(self, prompt: str):
+        self.prompts.append(prompt)
+        for needle, answer in self.responses.items():
+            if needle in prompt:
+                return LLMResponse(answer)
+        return LLMResponse(self.default)
+
+    async def ainvoke(self, prompt: str):
+        return self.invoke(prompt)
+
+    def stream(self, prompt: str):
+        yield from re.findall(r"\S+\s*", self.invoke(prompt).content)
@@ -1,34 +1,118 @@
-import re
+# main.py
+#
+# LangGraph agent: builds the graph only. Importing this module makes no
+# network calls and touches no files; the LLM client (and the .env lookup,
+# Gemini configuration and response cache) is created on first use by
+# get_llm(). The demo queries live in demo.py.
+#
+# Every LLM-calling node has a sync and an async implementation, so the same
+# graph serves graph.stream / graph.invoke (Streamlit, demo.py) and
+# graph.ainvoke (batch.py). stream_query() yields the answer token by token
+# plus an event as each node finishes.
+#
+# Every node is registered through instrument(): per-node wall time, LLM tokens,
+# cache hits and retry_count changes go into state["metrics"] and the `metrics` sink.
+
 import os
+import time
+from functools import lru_cache
 from typing import TypedDict, Literal
-from dotenv import load_dotenv
 
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, START, END
 from langchain.prompts import PromptTemplate
+from langchain_core.runnables import RunnableLambda
 from langchain_core.tools import tool
-import google.generativeai as genai
+from llm_cache import CachedLLM, FakeLLM, MemoryCache, SQLiteCache
+from fast_router import FastPathRouter
+from instrumentation import MetricsSink, instrument, record_llm_call
+from safe_math import evaluate, extract_expression
+from verification import VerificationPolicy
+
+# Prompt templates, compiled once instead of in every node call
+AGENT_PROMPT = PromptTemplate(
+    input_variables=["query"],
+    template="Decide which tool to use for this query: {query}. Return 'calculator' for math queries or 'llm' for general knowledge."
+)
+LLM_PROMPT = PromptTemplate(
+    input_variables=["query"],
+    template="Answer the following question: {query}"
+)
 
-# Load environment variables from .env
-load_dotenv()
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
-# Configure Gemini
-genai.configure(api_key=GOOGLE_API_KEY)
+def _usage(response):
+    """(prompt tokens, output tokens) reported by Gemini, if any"""
+    metadata = getattr(response, "usage_metadata", None)
+    if metadata is None:
+        return None
+    return metadata.prompt_token_count, metadata.candidates_token_count
 
 
 class GeminiLLM:
     def __init__(self, model_name="gemini-1.5-flash"):
+        import google.generativeai as genai  # heavy import, deferred to first use
+
+        self.model_name = model_name
         self.model = genai.GenerativeModel(model_name)
 
     def invoke(self, prompt: str):
         try:
             response = self.model.generate_content(prompt)
-            return type("GeminiResponse", (object,), {"content": response.text})()
+            return type("GeminiResponse", (object,), {"content": response.text, "usage": _usage(response)})()
+        except Exception as e:
+            return type("GeminiResponse", (object,), {"content": f"Error: {str(e)}"})()
+
+    async def ainvoke(self, prompt: str):
+        try:
+            response = await self.model.generate_content_async(prompt)
+            return type("GeminiResponse", (object,), {"content": response.text, "usage": _usage(response)})()
         except Exception as e:
             return type("GeminiResponse", (object,), {"content": f"Error: {str(e)}"})()
 
-# Initialize Gemini model
-llm = GeminiLLM()
+    def stream(self, prompt: str):
+        # Errors propagate to the caller (llm_node), so a partial answer is never cached
+        for chunk in self.model.generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+
+
+@lru_cache(maxsize=None)
+def get_llm() -> CachedLLM:
+    """Create the (cached) LLM client on first use."""
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env
+    load_dotenv()
+
+    # Initialize Gemini model (LLM_BACKEND=fake runs offline with canned answers)
+    if os.getenv("LLM_BACKEND") == "fake":
+        backend = FakeLLM()
+    else:
+        import google.generativeai as genai
+
+        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+        backend = GeminiLLM()
+
+    # Response cache: in-memory LRU, plus an on-disk tier unless LLM_CACHE_DB is empty
+    cache_ttl = float(os.getenv("LLM_CACHE_TTL", "3600"))
+    cache_tiers = [MemoryCache(max_size=int(os.getenv("LLM_CACHE_SIZE", "1024")), ttl=cache_ttl)]
+    if os.getenv("LLM_CACHE_DB", "llm_cache.db"):
+        cache_tiers.append(SQLiteCache(os.getenv("LLM_CACHE_DB", "llm_cache.db"), ttl=cache_ttl))
+    return CachedLLM(backend, cache_tiers, listener=record_llm_call)
+
+
+# Per-node metrics across all queries (AGENT_METRICS_FILE also appends them as JSON lines)
+metrics = MetricsSink(path=os.getenv("AGENT_METRICS_FILE") or None)
+
+# Local pre-classifier: obvious math/general queries skip the LLM router
+fast_router = FastPathRouter()
+
+# Calculator output is trusted (its errors fall back to the LLM); LLM answers are
+# verified within a retry budget
+verification_policy = VerificationPolicy(
+    max_retries=int(os.getenv("VERIFY_MAX_RETRIES", "3")),
+    max_seconds=float(os.getenv("VERIFY_MAX_SECONDS", "30")),
+)
 
 # Define the state
 class IntermediateState(TypedDict, total=False):
@@ -37,50 +121,78 @@ class IntermediateState(TypedDict, total=False):
     tool_output: str
     final_answer: str
     retry_count: int
+    route_source: str
+    started_at: float
+    verification: str
+    metrics: list
 
 # Tool: Calculator
 @tool
 def calculator(expression: str) -> str:
     """Evaluates a mathematical expression."""
     try:
-        return str(eval(expression, {"__builtins__": {}}, {}))  # Safe-ish eval
+        return str(evaluate(expression))  # AST whitelist, no eval()
     except Exception as e:
         return f"Error: {str(e)}"
 
 # Agent node to decide tool
-def agent_node(state: IntermediateState) -> IntermediateState:
+def _agent_fast_path(state: IntermediateState):
     print(f"Agent Node: Received state: {state}")
-    prompt = PromptTemplate(
-        input_variables=["query"],
-        template="Decide which tool to use for this query: {query}. Return 'calculator' for math queries or 'llm' for general knowledge."
-    )
-    tool_decision = llm.invoke(prompt.format(query=state["query"])).content.strip().lower()
+    state = {**state, "started_at": state.get("started_at", time.time())}  # retry budget clock
+    tool_decision = fast_router.classify(state["query"])
+    if tool_decision:
+        print(f"Agent Node: Fast-path decided tool: {tool_decision}")
+        return state, {**state, "tool_decision": tool_decision, "route_source": "fast_path"}
+    return state, None
+
+def _agent_decision(state: IntermediateState, content: str) -> IntermediateState:
+    tool_decision = content.strip().lower()
     print(f"Agent Node: Decided tool: {tool_decision}")
-    return {**state, "tool_decision": tool_decision}
+    return {**state, "tool_decision": tool_decision, "route_source": "llm"}
+
+def agent_node(state: IntermediateState) -> IntermediateState:
+    state, routed = _agent_fast_path(state)
+    if routed:
+        return routed
+    return _agent_decision(state, get_llm().invoke(AGENT_PROMPT.format(query=state["query"])).content)
+
+async def aagent_node(state: IntermediateState) -> IntermediateState:
+    state, routed = _agent_fast_path(state)
+    if routed:
+        return routed
+    return _agent_decision(state, (await get_llm().ainvoke(AGENT_PROMPT.format(query=state["query"]))).content)
 
 # Calculator node
 def calculator_node(state: IntermediateState) -> IntermediateState:
     print(f"Calculator Node: Received state: {state}")
     query = state["query"]
-    match = re.search(r"(\d+\s*[\+\-\*/]\s*\d+)", query)
-    if match:
-        expression = match.group(1)
+    expression = extract_expression(query)
+    if expression:
         print(f"Calculator Node: Extracted expression: {expression}")
         result = calculator.invoke(expression)
     else:
         result = "Error: Could not extract a valid mathematical expression."
     return {**state, "tool_output": result}
 
-# LLM node
+# LLM node: streams tokens to graph.stream(stream_mode="custom") consumers as they arrive
 def llm_node(state: IntermediateState) -> IntermediateState:
     print(f"LLM Node: Received state: {state}")
-    prompt = PromptTemplate(
-        input_variables=["query"],
-        template="Answer the following question: {query}"
-    )
+    write = get_stream_writer()
+    try:
+        chunks = []
+        for chunk in get_llm().stream(LLM_PROMPT.format(query=state["query"])):
+            chunks.append(chunk)
+            write({"node": "llm_node", "token": chunk})
+        result = "".join(chunks).strip()
+    except Exception as e:
+        result = f"Error in LLM invocation: {str(e)}"
+    return {**state, "tool_output": result}
+
+async def allm_node(state: IntermediateState) -> IntermediateState:
+    print(f"LLM Node: Received state: {state}")
     try:
-        response = llm.invoke(prompt.format(query=state["query"]))
-        result = response.content.strip() if hasattr(response, "content") else str(response)
+        response = await get_llm().ainvoke(LLM_PROMPT.format(query=state["query"]))
+        result = response.content.strip()
     except Exception as e:
         result = f"Error in LLM invocation: {str(e)}"
     return {**state, "tool_output": result}
@@ -88,15 +200,15 @@ def llm_node(state: IntermediateState) -> IntermediateState:
 # Verifier node
 def verifier_node(state: IntermediateState) -> IntermediateState:
     print(f"Verifier Node: Received state: {state}")
-    prompt = PromptTemplate(
-        input_variables=["query", "tool_output"],
-        template="Verify if the answer to '{query}' is correct: {tool_output}. If correct, provide the final answer. If incorrect, indicate 'retry'."
-    )
-    verification = llm.invoke(prompt.format(query=state["query"], tool_output=state["tool_output"])).content.strip().lower()
-    retry_count = state.get("retry_count", 0)
-    if "retry" in verification:
-        return {**state, "retry_count": retry_count + 1}
-    return {**state, "final_answer": state["tool_output"]}
+    result = verification_policy.apply(state, get_llm())
+    print(f"Verifier Node: {result['verification']}")
+    return result
+
+async def averifier_node(state: IntermediateState) -> IntermediateState:
+    print(f"Verifier Node: Received state: {state}")
+    result = await verification_policy.aapply(state, get_llm())
+    print(f"Verifier Node: {result['verification']}")
+    return result
 
 # Route to calculator or llm
 def route_tool(state: IntermediateState) -> Literal["calculator_node", "llm_node"]:
@@ -106,34 +218,50 @@ def route_tool(state: IntermediateState) -> Literal["calculator_node", "llm_node
 # Conditional retry or finish
 def route_verifier(state: IntermediateState) -> Literal["calculator_node", "llm_node", END]:
     if "final_answer" not in state or not state["final_answer"]:
-        if state.get("retry_count", 0) < 3:
+        # The policy finalizes once the budget is spent; the cap is a safety net
+        if state.get("retry_count", 0) <= verification_policy.max_retries:
             return route_tool(state)
     return END
 
+# Register a node with its sync (and optional async) implementation, both instrumented
+def add_node(builder, name, func, afunc=None):
+    func = instrument(name, func, metrics)
+    if afunc is not None:
+        func = RunnableLambda(func, afunc=instrument(name, afunc, metrics))
+    builder.add_node(name, func)
+
 # Build the graph
-builder = StateGraph(IntermediateState)
-builder.add_node("agent_node", agent_node)
-builder.add_node("calculator_node", calculator_node)
-builder.add_node("llm_node", llm_node)
-builder.add_node("verifier_node", verifier_node)
-
-builder.add_edge(START, "agent_node")
-builder.add_conditional_edges("agent_node", route_tool)
-builder.add_edge("calculator_node", "verifier_node")
-builder.add_edge("llm_node", "verifier_node")
-builder.add_conditional_edges("verifier_node", route_verifier)
-
-graph = builder.compile()
-
-# Run the graph with test queries
-queries = [
-    "What is 7 * 4?",
-    "Who won the Nobel Peace Prize in 2020?"
-]
-
-for query in queries:
-    print("\n===============================")
-    input_state = {"query": query, "retry_count": 0}
-    result = graph.invoke(input_state)
-    print(f"User Query: {result['query']}")
-    print(f"Final Answer: {result.get('final_answer', 'No answer')}")
+def build_graph():
+    builder = StateGraph(IntermediateState)
+    add_node(builder, "agent_node", agent_node, aagent_node)
+    add_node(builder, "calculator_node", calculator_node)
+    add_node(builder, "llm_node", llm_node, allm_node)
+    add_node(builder, "verifier_node", verifier_node, averifier_node)
+
+    builder.add_edge(START, "agent_node")
+    builder.add_conditional_edges("agent_node", route_tool)
+    builder.add_edge("calculator_node", "verifier_node")
+    builder.add_edge("llm_node", "verifier_node")
+    builder.add_conditional_edges("verifier_node", route_verifier)
+
+    return builder.compile()
+
+
+graph = build_graph()
+
+
+def stream_query(query: str, compiled_graph=None):
+    """Run `query` through the graph (default: the module's `graph`), yielding events as they happen:
+
+    {"type": "token", "node": ..., "text": ...}                 a piece of the LLM answer
+    {"type": "node", "node": ..., "state": ..., "seconds": ...}  a node finished (its output state)
+    """
+    last = time.perf_counter()
+    for mode, chunk in (compiled_graph or graph).stream({"query": query, "retry_count": 0}, stream_mode=["updates", "custom"]):
+        if mode == "custom":
+            yield {"type": "token", "node": chunk["node"], "text": chunk["token"]}
+            continue
+        now = time.perf_counter()
+        for node, update in chunk.items():
+            yield {"type": "node", "node": node, "state": update, "seconds": now - last}
+        last = now
@@ -0,0 +1,133 @@
+# safe_math.py
+#
+# Arithmetic engine for the calculator tool, replacing eval().
+#   - Expressions are parsed with `ast` and only numbers, + - * / // % ** and
+#     parentheses are accepted; names, calls, attributes etc. are rejected.
+#   - Each accepted expression is compiled once into nested closures and kept
+#     in an LRU cache, so repeated expressions skip parsing entirely.
+#   - Power and multiplication check the size of their result before computing
+#     it, so inputs like 9**9**9 fail fast instead of hanging the worker.
+#   - Complex (e.g. (-8)**0.5) and non-finite (e.g. 1e308*10) results are rejected.
+#   - find_expression() pulls an expression out of a natural-language query,
+#     e.g. "What is (3 + 4) * 2.5?", "12 x 3", "12 X 3", "2^10", "100 ÷ 8".
+
+import ast
+import math
+import operator
+import re
+from functools import lru_cache
+
+MAX_EXPRESSION_LENGTH = 200
+MAX_RESULT_DIGITS = 1000  # largest integer result we are willing to build
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+# Runs of characters that can form an expression inside a sentence
+_CANDIDATE = re.compile(r"[\d\s.+\-*/%^()×÷xX]+")
+_SYMBOLS = {"×": "*", "÷": "/", "^": "**", "x": "*", "X": "*"}
+
+
+def _digits(value) -> float:
+    return math.log10(abs(value)) + 1 if value else 1
+
+
+def _checked_pow(base, exponent):
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        if exponent * math.log10(abs(base)) + 1 > MAX_RESULT_DIGITS:
+            raise ValueError(f"result would exceed {MAX_RESULT_DIGITS} digits")
+    return base ** exponent
+
+
+def _checked_mul(left, right):
+    if isinstance(left, int) and isinstance(right, int):
+        if _digits(left) + _digits(right) > MAX_RESULT_DIGITS + 1:
+            raise ValueError(f"result would exceed {MAX_RESULT_DIGITS} digits")
+    return left * right
+
+
+def _compile(node):
+    """Turn a whitelisted AST node into a zero-argument function computing its value."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        return lambda: value
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        op, operand = _UNARY_OPS[type(node.op)], _compile(node.operand)
+        return lambda: op(operand())
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        left, right = _compile(node.left), _compile(node.right)
+        if isinstance(node.op, ast.Pow):
+            return lambda: _checked_pow(left(), right())
+        if isinstance(node.op, ast.Mult):
+            return lambda: _checked_mul(left(), right())
+        op = _BINARY_OPS[type(node.op)]
+        return lambda: op(left(), right())
+
+    raise ValueError(f"unsupported element: {type(node).__name__}")
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression: str):
+    """Validate and compile an arithmetic expression; raises ValueError/SyntaxError if not allowed."""
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    return _compile(ast.parse(expression.strip(), mode="eval").body)
+
+
+def evaluate(expression: str):
+    result = compile_expression(expression)()
+    if isinstance(result, complex):
+        raise ValueError("result is not a real number")
+    if isinstance(result, float) and not math.isfinite(result):
+        raise ValueError("result is too large or undefined")
+    return result
+
+
+@lru_cache(maxsize=1024)
+def _is_binary_expression(expression: str) -> bool:
+    """True for an allowed expression with at least one binary operator (not just "-19")"""
+    try:
+        compile_expression(expression)
+    except (SyntaxError, ValueError):
+        return False
+    return isinstance(ast.parse(expression, mode="eval").body, ast.BinOp)
+
+
+def _normalize(text: str) -> str:
+    return "".join(_SYMBOLS.get(ch, ch) for ch in text)
+
+
+def find_expression(text: str):
+    """Longest arithmetic expression (with at least one binary operator) in `text`.
+
+    Returns (start, end, normalized expression) or None.
+    """
+    best = None
+    for match in _CANDIDATE.finditer(text):
+        raw = match.group()
+        for candidate in (raw.strip(" .xX"), raw.strip(" .xX()")):
+            if not re.search(r"\d", candidate):
+                continue
+            expression = _normalize(candidate)
+            if not _is_binary_expression(expression):
+                continue
+            start = match.start() + raw.index(candidate)
+            if best is None or len(candidate) > best[1] - best[0]:
+                best = (start, start + len(candidate), expression)
+            break
+    return best
+
+
+def extract_expression(text: str):
+    found = find_expression(text)
+    return found[2] if found else None
@@ -0,0 +1,84 @@
+# verification.py
+#
+# Verification policy used by verifier_node.
+#   - Deterministic tools (the calculator) are trusted: their output is final,
+#     and retrying would only reproduce it, so no LLM call is made.
+#   - Tool errors ("Error: ...") are never accepted: a failed trusted tool falls
+#     back to the LLM ("fallback"), a failed LLM call is retried ("retry"),
+#     without asking the LLM to verify the error text.
+#   - LLM answers are verified by the LLM; "retry" sends the query back to the tool.
+#   - Retries are budgeted: at most `max_retries` re-runs and `max_seconds` of wall
+#     time per query. When the budget is spent the last answer is returned,
+#     marked "budget_exhausted", so worst-case latency per query is bounded.
+
+import time
+
+from langchain.prompts import PromptTemplate
+
+VERIFY_PROMPT = PromptTemplate(
+    input_variables=["query", "tool_output"],
+    template="Verify if the answer to '{query}' is correct: {tool_output}. If correct, provide the final answer. If incorrect, indicate 'retry'.",
+)
+
+# Prefixes of the error strings the calculator tool and the LLM nodes return
+ERROR_PREFIXES = ("Error:", "Error in LLM invocation:")
+
+
+class VerificationPolicy:
+    def __init__(self, trusted_tools=("calculator",), max_retries: int = 3, max_seconds: float = 30.0):
+        self.trusted_tools = set(trusted_tools)
+        self.max_retries = max_retries
+        self.max_seconds = max_seconds
+
+    def verify(self, llm, query: str, tool_output: str) -> bool:
+        """Ask the LLM whether the answer is correct; True means it is accepted."""
+        return self._parse(llm.invoke(self._prompt(query, tool_output)).content)
+
+    async def averify(self, llm, query: str, tool_output: str) -> bool:
+        return self._parse((await llm.ainvoke(self._prompt(query, tool_output))).content)
+
+    def budget_left(self, state) -> bool:
+        elapsed = time.time() - state.get("started_at", time.time())
+        return state.get("retry_count", 0) < self.max_retries and elapsed < self.max_seconds
+
+    def apply(self, state, llm) -> dict:
+        """State update for verifier_node: a final answer, or a retry while budget remains."""
+        decided = self._decide_without_llm(state)
+        if decided is not None:
+            return decided
+        return self._result(state, self.verify(llm, state["query"], state["tool_output"]))
+
+    async def aapply(self, state, llm) -> dict:
+        decided = self._decide_without_llm(state)
+        if decided is not None:
+            return decided
+        return self._result(state, await self.averify(llm, state["query"], state["tool_output"]))
+
+    def _decide_without_llm(self, state):
+        failed = state.get("tool_output", "").startswith(ERROR_PREFIXES)
+        trusted = state.get("tool_decision") in self.trusted_tools
+        if trusted and not failed:
+            return {**state, "final_answer": state["tool_output"], "verification": "trusted"}
+        if not self.budget_left(state):
+            return {**state, "final_answer": state["tool_output"], "verification": "budget_exhausted"}
+        if trusted:
+            # Re-running a deterministic tool would fail the same way; let the LLM answer
+            return {**state, "tool_decision": "llm", "retry_count": state.get("retry_count", 0) + 1,
+                    "verification": "fallback"}
+        if failed:
+            return self._result(state, False)
+        return None
+
+    @staticmethod
+    def _result(state, accepted: bool) -> dict:
+        if accepted:
+            return {**state, "final_answer": state["tool_output"], "verification": "verified"}
+        return {**state, "retry_count": state.get("retry_count", 0) + 1, "verification": "retry"}
+
+    @staticmethod
+    def _prompt(query: str, tool_output: str) -> str:
+        return VERIFY_PROMPT.format(query=query, tool_output=tool_output)
+
+    @staticmethod
+    def _parse(reply: str) -> bool:
+        return "retry" not in reply.strip().lower()